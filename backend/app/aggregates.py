@@ -0,0 +1,600 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import Connection, case, delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, UOWTransaction
+
+from .models import (
+    FieldChoiceAggregate,
+    FieldReportAggregate,
+    FieldType,
+    Form,
+    FormField,
+    FormReportAggregate,
+    FormResponse,
+    ResponseFieldValue,
+    ResponseStatus,
+    parse_numeric_value,
+)
+
+logger = logging.getLogger(__name__)
+
+_MISSING: Any = object()
+
+
+@dataclass
+class FieldAggregate:
+    answered_count: int = 0
+    numeric_count: int = 0
+    numeric_sum: float = 0.0
+    min_value: float | None = None
+    max_value: float | None = None
+    distribution: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def average(self) -> float | None:
+        return self.numeric_sum / self.numeric_count if self.numeric_count else None
+
+
+@dataclass
+class FormAggregate:
+    total_responses: int
+    completed_responses: int
+    fields: dict[int, FieldAggregate]
+
+
+def _is_completed_response():
+    return (FormResponse.status == ResponseStatus.completed) & FormResponse.is_completed.is_(True)
+
+
+def _completed_values(form_id: int, *columns):
+    """Select ``columns`` from the values of completed responses of a form.
+
+    The completed-response filter is applied through a join on
+    ``form_responses`` so it runs server side on both SQLite and PostgreSQL
+    without materialising response IDs in Python.
+    """
+    return (
+        select(*columns)
+        .join(FormResponse, FormResponse.id == ResponseFieldValue.response_id)
+        .where(FormResponse.form_id == form_id)
+        .where(_is_completed_response())
+    )
+
+
+def compute_form_aggregate(session: Session, form_id: int) -> FormAggregate:
+    """Aggregate a form from the raw response tables.
+
+    A summary statement counts responses, one grouped statement computes
+    answered counts and numeric totals for all fields and a second one builds
+    the choice distributions; the number of round trips does not depend on how
+    many fields the form has. Numeric and choice statistics read the typed
+    ``numeric_value``/``choice_value`` columns, which are only populated for
+    fields of the matching type.
+    """
+    summary_stmt = select(
+        func.count(FormResponse.id),
+        func.count(case((_is_completed_response(), FormResponse.id))),
+    ).where(FormResponse.form_id == form_id)
+    total_responses, completed_responses = session.execute(summary_stmt).one()
+
+    fields: dict[int, FieldAggregate] = defaultdict(FieldAggregate)
+    if completed_responses:
+        numeric_value = ResponseFieldValue.numeric_value
+        field_stmt = _completed_values(
+            form_id,
+            ResponseFieldValue.field_id,
+            func.count(ResponseFieldValue.id),
+            func.count(numeric_value),
+            func.sum(numeric_value),
+            func.min(numeric_value),
+            func.max(numeric_value),
+        ).group_by(ResponseFieldValue.field_id)
+        for field_id, answered, numeric_count, numeric_sum, min_value, max_value in session.execute(field_stmt).all():
+            fields[int(field_id)] = FieldAggregate(
+                answered_count=int(answered or 0),
+                numeric_count=int(numeric_count or 0),
+                numeric_sum=float(numeric_sum or 0.0),
+                min_value=float(min_value) if min_value is not None else None,
+                max_value=float(max_value) if max_value is not None else None,
+            )
+
+        choice_value = ResponseFieldValue.choice_value
+        choice_stmt = (
+            _completed_values(form_id, ResponseFieldValue.field_id, choice_value, func.count(ResponseFieldValue.id))
+            .where(choice_value.is_not(None))
+            .group_by(ResponseFieldValue.field_id, choice_value)
+        )
+        for field_id, choice, count in session.execute(choice_stmt).all():
+            fields[int(field_id)].distribution[choice] = int(count)
+
+    return FormAggregate(
+        total_responses=int(total_responses or 0),
+        completed_responses=int(completed_responses or 0),
+        fields=fields,
+    )
+
+
+def load_form_aggregate(session: Session, form_id: int) -> FormAggregate | None:
+    """Read the materialised aggregates of a form.
+
+    Returns ``None`` when the form has not been materialised yet or when an
+    incremental update could not be applied exactly, in which case callers
+    should fall back to :func:`compute_form_aggregate`.
+    """
+    summary = session.execute(
+        select(FormReportAggregate.total_responses, FormReportAggregate.completed_responses)
+        .where(FormReportAggregate.form_id == form_id)
+        .where(FormReportAggregate.is_stale.is_(False))
+    ).one_or_none()
+    if summary is None:
+        return None
+
+    fields: dict[int, FieldAggregate] = defaultdict(FieldAggregate)
+    field_stmt = select(
+        FieldReportAggregate.field_id,
+        FieldReportAggregate.answered_count,
+        FieldReportAggregate.numeric_count,
+        FieldReportAggregate.numeric_sum,
+        FieldReportAggregate.numeric_min,
+        FieldReportAggregate.numeric_max,
+    ).where(FieldReportAggregate.form_id == form_id)
+    for field_id, answered, numeric_count, numeric_sum, min_value, max_value in session.execute(field_stmt).all():
+        fields[field_id] = FieldAggregate(
+            answered_count=answered,
+            numeric_count=numeric_count,
+            numeric_sum=numeric_sum,
+            min_value=min_value,
+            max_value=max_value,
+        )
+
+    choice_stmt = (
+        select(FieldChoiceAggregate.field_id, FieldChoiceAggregate.choice, FieldChoiceAggregate.count)
+        .where(FieldChoiceAggregate.form_id == form_id)
+        .where(FieldChoiceAggregate.count > 0)
+    )
+    for field_id, choice, count in session.execute(choice_stmt).all():
+        fields[field_id].distribution[choice] = count
+
+    total_responses, completed_responses = summary
+    return FormAggregate(total_responses=total_responses, completed_responses=completed_responses, fields=fields)
+
+
+def rebuild_form_aggregate(session: Session, form_id: int) -> FormAggregate:
+    """Recompute the materialised aggregates of a form from the raw tables."""
+    aggregate = compute_form_aggregate(session, form_id)
+    field_ids = session.execute(select(FormField.id).where(FormField.form_id == form_id)).scalars().all()
+
+    session.execute(delete(FieldChoiceAggregate).where(FieldChoiceAggregate.form_id == form_id))
+    session.execute(delete(FieldReportAggregate).where(FieldReportAggregate.form_id == form_id))
+    session.execute(delete(FormReportAggregate).where(FormReportAggregate.form_id == form_id))
+
+    session.execute(
+        insert(FormReportAggregate).values(
+            form_id=form_id,
+            total_responses=aggregate.total_responses,
+            completed_responses=aggregate.completed_responses,
+            is_stale=False,
+            rebuilt_at=datetime.utcnow(),
+        )
+    )
+    if field_ids:
+        session.execute(
+            insert(FieldReportAggregate),
+            [
+                {
+                    "field_id": field_id,
+                    "form_id": form_id,
+                    "answered_count": aggregate.fields[field_id].answered_count,
+                    "numeric_count": aggregate.fields[field_id].numeric_count,
+                    "numeric_sum": aggregate.fields[field_id].numeric_sum,
+                    "numeric_min": aggregate.fields[field_id].min_value,
+                    "numeric_max": aggregate.fields[field_id].max_value,
+                }
+                for field_id in field_ids
+            ],
+        )
+    choice_rows = [
+        {"field_id": field_id, "choice": choice, "form_id": form_id, "count": count}
+        for field_id, field_aggregate in aggregate.fields.items()
+        for choice, count in field_aggregate.distribution.items()
+    ]
+    if choice_rows:
+        session.execute(insert(FieldChoiceAggregate), choice_rows)
+    return aggregate
+
+
+def rebuild_all_form_aggregates(session: Session) -> int:
+    """Reconcile the materialised aggregates of every form; returns the form count."""
+    form_ids = session.execute(select(Form.id)).scalars().all()
+    for form_id in form_ids:
+        rebuild_form_aggregate(session, form_id)
+    return len(form_ids)
+
+
+# ---------------------------------------------------------------------------
+# Incremental maintenance
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _FieldDelta:
+    answered_count: int = 0
+    numeric_count: int = 0
+    numeric_sum: float = 0.0
+    min_value: float | None = None
+    max_value: float | None = None
+    choices: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class _FormDelta:
+    total_responses: int = 0
+    completed_responses: int = 0
+    is_stale: bool = False
+    fields: dict[int, _FieldDelta] = field(default_factory=lambda: defaultdict(_FieldDelta))
+
+
+def _loaded(obj: object, key: str) -> Any:
+    """Return the in-memory value of ``key`` without triggering a lazy load."""
+    return inspect(obj).dict.get(key, _MISSING)
+
+
+def _previous(obj: object, key: str, persisted: dict[tuple[type, int], dict[str, Any]] | None = None) -> Any:
+    """Return the pre-flush value of ``key``, or ``_MISSING`` when it is unknown."""
+    history = inspect(obj).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if not history.added:
+        return _loaded(obj, key)
+    if persisted is not None:
+        return persisted.get((type(obj), obj.id), {}).get(key, _MISSING)
+    return _MISSING
+
+
+def _current(obj: object, key: str, persisted: dict[tuple[type, int], dict[str, Any]]) -> Any:
+    history = inspect(obj).attrs[key].history
+    return history.added[0] if history.added else _previous(obj, key, persisted)
+
+
+def _changed(obj: object, *keys: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[key].history.added for key in keys)
+
+
+_TRACKED_COLUMNS = {
+    FormResponse: ("status", "is_completed"),
+    ResponseFieldValue: ("value", "field_id"),
+}
+_PERSISTED_STATE_KEY = "report_aggregates.persisted_state"
+_STALE_FORMS_KEY = "report_aggregates.stale_forms"
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_persisted_state(session: Session, flush_context: UOWTransaction, instances: Any) -> None:
+    """Remember the stored values of expired attributes that are about to change.
+
+    Assigning to an expired attribute leaves no "old value" in the attribute
+    history, so the rows are read once here, before the flush overwrites them.
+    """
+    unknown: dict[type, list[int]] = defaultdict(list)
+    for obj in session.dirty:
+        columns = _TRACKED_COLUMNS.get(type(obj))
+        if columns and _changed(obj, *columns) and any(_previous(obj, column) is _MISSING for column in columns):
+            unknown[type(obj)].append(obj.id)
+    if not unknown:
+        return
+    persisted: dict[tuple[type, int], dict[str, Any]] = {}
+    connection = session.connection()
+    for model, ids in unknown.items():
+        columns = _TRACKED_COLUMNS[model]
+        stmt = select(model.id, *(getattr(model, column) for column in columns)).where(model.id.in_(ids))
+        for row in connection.execute(stmt).all():
+            persisted[(model, row[0])] = dict(zip(columns, row[1:]))
+    session.info[_PERSISTED_STATE_KEY] = persisted
+
+
+def _completed(status: Any, is_completed: Any) -> bool:
+    return status == ResponseStatus.completed and bool(is_completed)
+
+
+class _DeltaCollector:
+    def __init__(self, connection: Connection, persisted: dict[tuple[type, int], dict[str, Any]]) -> None:
+        self.connection = connection
+        self.persisted = persisted
+        self.forms: dict[int, _FormDelta] = defaultdict(_FormDelta)
+        self.new_form_ids: list[int] = []
+        self.handled_response_ids: set[int] = set()
+        self.completed_response_ids: list[int] = []
+        self.value_changes: list[tuple[int, int, Any, Any]] = []
+
+    def response_changed(self, response: FormResponse, *, is_new: bool, is_deleted: bool) -> None:
+        delta = self.forms[response.form_id]
+        self.handled_response_ids.add(response.id)
+        if is_new:
+            delta.total_responses += 1
+            if _completed(_loaded(response, "status"), _loaded(response, "is_completed")):
+                delta.completed_responses += 1
+                self.completed_response_ids.append(response.id)
+            return
+        if is_deleted:
+            delta.total_responses -= 1
+            was_completed = _completed(_loaded(response, "status"), _loaded(response, "is_completed"))
+            if was_completed or _loaded(response, "status") is _MISSING:
+                delta.is_stale = True
+            return
+
+        if not _changed(response, "status", "is_completed"):
+            self.handled_response_ids.discard(response.id)
+            return
+        old_status = _previous(response, "status", self.persisted)
+        old_flag = _previous(response, "is_completed", self.persisted)
+        if old_status is _MISSING or old_flag is _MISSING:
+            delta.is_stale = True
+            return
+        was_completed = _completed(old_status, old_flag)
+        now_completed = _completed(
+            _current(response, "status", self.persisted), _current(response, "is_completed", self.persisted)
+        )
+        if was_completed == now_completed:
+            self.handled_response_ids.discard(response.id)
+        elif now_completed:
+            delta.completed_responses += 1
+            self.completed_response_ids.append(response.id)
+        else:
+            delta.completed_responses -= 1
+            delta.is_stale = True
+
+    def value_changed(self, value: ResponseFieldValue, *, is_new: bool, is_deleted: bool) -> None:
+        if is_new:
+            old, new = None, value.value
+        elif is_deleted:
+            old, new = _loaded(value, "value"), None
+        else:
+            if not _changed(value, "value", "field_id"):
+                return
+            old, new = _previous(value, "value", self.persisted), _current(value, "value", self.persisted)
+            if _previous(value, "field_id", self.persisted) not in (_MISSING, value.field_id):
+                # Moving a value between fields is not expressible as a single delta.
+                old = _MISSING
+        self.value_changes.append((value.response_id, value.field_id, old, new))
+
+    def collect_values(self) -> None:
+        """Resolve value changes to fields of completed responses."""
+        if self.completed_response_ids:
+            rows = self.connection.execute(
+                select(ResponseFieldValue.field_id, ResponseFieldValue.value).where(
+                    ResponseFieldValue.response_id.in_(self.completed_response_ids)
+                )
+            ).all()
+            self._apply_values((field_id, None, value) for field_id, value in rows)
+
+        pending = [change for change in self.value_changes if change[0] not in self.handled_response_ids]
+        if not pending:
+            return
+        response_ids = {response_id for response_id, _, _, _ in pending}
+        completed_ids = set(
+            self.connection.execute(
+                select(FormResponse.id).where(FormResponse.id.in_(response_ids)).where(_is_completed_response())
+            ).scalars()
+        )
+        self._apply_values(
+            (field_id, old, new) for response_id, field_id, old, new in pending if response_id in completed_ids
+        )
+
+    def _apply_values(self, changes: Iterable[tuple[int, Any, Any]]) -> None:
+        changes = list(changes)
+        if not changes:
+            return
+        field_ids = {field_id for field_id, _, _ in changes}
+        field_info = {
+            field_id: (form_id, field_type)
+            for field_id, form_id, field_type in self.connection.execute(
+                select(FormField.id, FormField.form_id, FormField.field_type).where(FormField.id.in_(field_ids))
+            ).all()
+        }
+        for field_id, old, new in changes:
+            if field_id not in field_info:
+                continue
+            form_id, field_type = field_info[field_id]
+            form_delta = self.forms[form_id]
+            if old is _MISSING:
+                form_delta.is_stale = True
+                continue
+            delta = form_delta.fields[field_id]
+            if old is not None:
+                delta.answered_count -= 1
+                if field_type == FieldType.choice:
+                    delta.choices[old] -= 1
+                elif field_type == FieldType.number and parse_numeric_value(old) is not None:
+                    # Removing a value may invalidate min/max; let the rebuild reconcile it.
+                    form_delta.is_stale = True
+            if new is not None:
+                delta.answered_count += 1
+                if field_type == FieldType.choice:
+                    delta.choices[new] += 1
+                elif field_type == FieldType.number:
+                    number = parse_numeric_value(new)
+                    if number is not None:
+                        delta.numeric_count += 1
+                        delta.numeric_sum += number
+                        delta.min_value = number if delta.min_value is None else min(delta.min_value, number)
+                        delta.max_value = number if delta.max_value is None else max(delta.max_value, number)
+
+
+def _upsert(connection: Connection, model: type, key_columns: list[str], values: dict[str, Any], set_: dict[str, Any]):
+    """Insert ``values`` or apply ``set_`` to the existing row, atomically when supported."""
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(model).values(**values)
+        excluded = stmt.excluded
+        resolved = {key: value(excluded) if callable(value) else value for key, value in set_.items()}
+        connection.execute(stmt.on_conflict_do_update(index_elements=key_columns, set_=resolved))
+        return
+    table = model.__table__
+    key_filter = [table.c[column] == values[column] for column in key_columns]
+    resolved = {key: value(_ValuesProxy(values)) if callable(value) else value for key, value in set_.items()}
+    result = connection.execute(update(model).where(*key_filter).values(**resolved))
+    if result.rowcount == 0:
+        connection.execute(insert(model).values(**values))
+
+
+class _ValuesProxy:
+    """Expose plain insert values with the ``excluded.<column>`` interface."""
+
+    def __init__(self, values: dict[str, Any]) -> None:
+        self._values = values
+
+    def __getattr__(self, name: str) -> Any:
+        return self._values[name]
+
+
+def _merge_min(column, candidate):
+    return case(
+        (candidate.is_(None), column),
+        (column.is_(None) | (candidate < column), candidate),
+        else_=column,
+    )
+
+
+def _merge_max(column, candidate):
+    return case(
+        (candidate.is_(None), column),
+        (column.is_(None) | (candidate > column), candidate),
+        else_=column,
+    )
+
+
+def _apply_form_delta(connection: Connection, form_id: int, delta: _FormDelta) -> None:
+    counters = {
+        "total_responses": FormReportAggregate.total_responses + delta.total_responses,
+        "completed_responses": FormReportAggregate.completed_responses + delta.completed_responses,
+    }
+    if delta.is_stale:
+        counters["is_stale"] = True
+    result = connection.execute(
+        update(FormReportAggregate).where(FormReportAggregate.form_id == form_id).values(**counters)
+    )
+    if result.rowcount == 0 or delta.is_stale:
+        # Forms that were never materialised are picked up by the next rebuild.
+        return
+
+    fields = FieldReportAggregate.__table__.c
+    for field_id, field_delta in delta.fields.items():
+        _upsert(
+            connection,
+            FieldReportAggregate,
+            ["field_id"],
+            {
+                "field_id": field_id,
+                "form_id": form_id,
+                "answered_count": field_delta.answered_count,
+                "numeric_count": field_delta.numeric_count,
+                "numeric_sum": field_delta.numeric_sum,
+                "numeric_min": field_delta.min_value,
+                "numeric_max": field_delta.max_value,
+            },
+            {
+                "answered_count": lambda excluded: fields.answered_count + excluded.answered_count,
+                "numeric_count": lambda excluded: fields.numeric_count + excluded.numeric_count,
+                "numeric_sum": lambda excluded: fields.numeric_sum + excluded.numeric_sum,
+                "numeric_min": lambda excluded: _merge_min(fields.numeric_min, excluded.numeric_min),
+                "numeric_max": lambda excluded: _merge_max(fields.numeric_max, excluded.numeric_max),
+            },
+        )
+        choices = FieldChoiceAggregate.__table__.c
+        for choice, count in field_delta.choices.items():
+            if count == 0:
+                continue
+            _upsert(
+                connection,
+                FieldChoiceAggregate,
+                ["field_id", "choice"],
+                {"field_id": field_id, "choice": choice, "form_id": form_id, "count": count},
+                {"count": lambda excluded: choices.count + excluded.count},
+            )
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_incremental_updates(session: Session, flush_context: UOWTransaction) -> None:
+    """Fold the response writes of a flush into the materialised aggregates."""
+    collector: _DeltaCollector | None = None
+    persisted = session.info.pop(_PERSISTED_STATE_KEY, {})
+
+    def _collector() -> _DeltaCollector:
+        nonlocal collector
+        if collector is None:
+            collector = _DeltaCollector(session.connection(), persisted)
+        return collector
+
+    for obj in session.new:
+        if isinstance(obj, Form):
+            _collector().new_form_ids.append(obj.id)
+        elif isinstance(obj, FormResponse):
+            _collector().response_changed(obj, is_new=True, is_deleted=False)
+    for obj in session.dirty:
+        if isinstance(obj, FormResponse) and session.is_modified(obj, include_collections=False):
+            _collector().response_changed(obj, is_new=False, is_deleted=False)
+    for obj in session.deleted:
+        if isinstance(obj, FormResponse):
+            _collector().response_changed(obj, is_new=False, is_deleted=True)
+
+    for obj in session.new:
+        if isinstance(obj, ResponseFieldValue):
+            _collector().value_changed(obj, is_new=True, is_deleted=False)
+    for obj in session.dirty:
+        if isinstance(obj, ResponseFieldValue) and session.is_modified(obj, include_collections=False):
+            _collector().value_changed(obj, is_new=False, is_deleted=False)
+    for obj in session.deleted:
+        if isinstance(obj, ResponseFieldValue):
+            _collector().value_changed(obj, is_new=False, is_deleted=True)
+
+    if collector is None:
+        return
+    connection = collector.connection
+    if collector.new_form_ids:
+        connection.execute(
+            insert(FormReportAggregate),
+            [{"form_id": form_id, "rebuilt_at": datetime.utcnow()} for form_id in collector.new_form_ids],
+        )
+    collector.collect_values()
+    for form_id, delta in collector.forms.items():
+        _apply_form_delta(connection, form_id, delta)
+    stale_form_ids = {form_id for form_id, delta in collector.forms.items() if delta.is_stale}
+    if stale_form_ids:
+        session.info.setdefault(_STALE_FORMS_KEY, set()).update(stale_form_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _rebuild_stale_forms(session: Session) -> None:
+    """Rebuild the aggregates a committed transaction marked stale.
+
+    The rebuild runs in its own session once the edit is durable, so stale
+    forms are repaired without waiting for the scheduler; if it fails the form
+    stays stale and reports keep falling back to live queries.
+    """
+    form_ids = session.info.pop(_STALE_FORMS_KEY, None)
+    if not form_ids:
+        return
+    try:
+        with Session(session.get_bind()) as rebuild_session, rebuild_session.begin():
+            existing = rebuild_session.execute(select(Form.id).where(Form.id.in_(form_ids))).scalars().all()
+            for form_id in sorted(existing):
+                rebuild_form_aggregate(rebuild_session, form_id)
+    except SQLAlchemyError:
+        logger.exception("Rebuilding stale report aggregates of forms %s failed", sorted(form_ids))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_stale_forms(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_STALE_FORMS_KEY, None)
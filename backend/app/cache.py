@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Iterable, TypeVar
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, UOWTransaction
+
+from .models import Form, FormField, FormResponse, ResponseFieldValue
+
+T = TypeVar("T")
+
+_PENDING_INVALIDATIONS_KEY = "report_cache.pending_form_ids"
+
+
+class ReportCache:
+    """In-process LRU cache with a TTL for computed reports and rendered exports.
+
+    Entries are keyed by ``(form_id, kind)`` so the report and each rendered
+    export of a form can be cached and invalidated together. Each form also has
+    a generation that ``invalidate`` bumps, so a value computed from data read
+    before an invalidation is never stored after it.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[float, Any]] = OrderedDict()
+        self._kinds_by_form: dict[int, set[Hashable]] = {}
+        self._generations: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, form_id: int, kind: Hashable = "report") -> Any | None:
+        key = (form_id, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, form_id: int) -> int:
+        with self._lock:
+            return self._generations.get(form_id, 0)
+
+    def set(self, form_id: int, value: Any, kind: Hashable = "report", generation: int | None = None) -> bool:
+        """Store ``value``; when ``generation`` is given, only if the form has
+        not been invalidated since it was read. Returns whether it was stored."""
+        key = (form_id, kind)
+        with self._lock:
+            if generation is not None and generation != self._generations.get(form_id, 0):
+                return False
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            self._kinds_by_form.setdefault(form_id, set()).add(kind)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+        return True
+
+    def get_or_compute(self, form_id: int, compute: Callable[[], T], kind: Hashable = "report") -> T:
+        generation = self.generation(form_id)
+        cached = self.get(form_id, kind)
+        if cached is not None:
+            return cached
+        value = compute()
+        self.set(form_id, value, kind, generation=generation)
+        return value
+
+    def invalidate(self, form_id: int) -> None:
+        with self._lock:
+            self._generations[form_id] = self._generations.get(form_id, 0) + 1
+            kinds = self._kinds_by_form.pop(form_id, set())
+            for kind in kinds:
+                self._entries.pop((form_id, kind), None)
+            if kinds:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._kinds_by_form.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _discard(self, key: tuple[int, Hashable]) -> None:
+        self._entries.pop(key, None)
+        kinds = self._kinds_by_form.get(key[0])
+        if kinds is not None:
+            kinds.discard(key[1])
+            if not kinds:
+                del self._kinds_by_form[key[0]]
+
+
+def configure_report_cache() -> ReportCache:
+    max_entries = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "256"))
+    ttl_seconds = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "300"))
+    return ReportCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+
+report_cache = configure_report_cache()
+
+
+def _changed_form_ids(session: Session, objects: Iterable[object]) -> set[int]:
+    form_ids: set[int] = set()
+    response_ids: set[int] = set()
+    with session.no_autoflush:
+        for obj in objects:
+            if isinstance(obj, Form):
+                form_ids.add(obj.id)
+            elif isinstance(obj, (FormField, FormResponse)):
+                form_ids.add(obj.form_id)
+            elif isinstance(obj, ResponseFieldValue) and obj.response_id is not None:
+                response_ids.add(obj.response_id)
+    if response_ids:
+        form_ids.update(
+            session.connection().execute(
+                select(FormResponse.form_id).where(FormResponse.id.in_(response_ids)).distinct()
+            ).scalars()
+        )
+    return form_ids
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_updated_forms(session: Session, flush_context: UOWTransaction, instances: Any) -> None:
+    """Record the forms touched by updates and deletes while their rows still exist."""
+    changed = _changed_form_ids(session, (*session.dirty, *session.deleted))
+    session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_inserted_forms(session: Session, flush_context: UOWTransaction) -> None:
+    """Record the forms touched by inserts once their IDs are assigned."""
+    changed = _changed_form_ids(session, session.new)
+    session.info.setdefault(_PENDING_INVALIDATIONS_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_forms(session: Session) -> None:
+    for form_id in session.info.pop(_PENDING_INVALIDATIONS_KEY, ()):
+        report_cache.invalidate(form_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_invalidations(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS_KEY, None)
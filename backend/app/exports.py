@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import csv
 import io
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator
 
 from fpdf import FPDF
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
+from .models import FieldType, Form, FormField, FormResponse, ResponseFieldValue, ResponseStatus, parse_numeric_value
 from .reporting import FormReport
 
+EXPORT_BATCH_SIZE = 1000
+
 
 def build_csv_report(report: FormReport) -> io.StringIO:
     buffer = io.StringIO()
@@ -59,3 +69,194 @@ def build_pdf_report(report: FormReport) -> io.BytesIO:
     buffer = io.BytesIO(pdf.output(dest="S").encode("latin1"))
     buffer.seek(0)
     return buffer
+
+
+@dataclass
+class ResponseRow:
+    response_id: int
+    status: ResponseStatus | None
+    is_completed: bool
+    submitted_at: datetime | None
+    values: list[str | None]
+
+
+class ExportDependencyError(RuntimeError):
+    """Raised when an export format needs an optional dependency that is missing."""
+
+
+def _export_fields(form: Form) -> list[FormField]:
+    return sorted(form.fields, key=lambda form_field: form_field.id)
+
+
+def iter_response_rows(session: Session, form: Form, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[ResponseRow]:
+    """Yield the responses of ``form`` pivoted to one row per response.
+
+    Values are read ordered by response through a server-side cursor, so each
+    response is emitted as soon as its last value arrives and memory use does
+    not grow with the number of responses. ``values`` follows the field order
+    of :func:`_export_fields`.
+    """
+    columns = {form_field.id: index for index, form_field in enumerate(_export_fields(form))}
+    stmt = (
+        select(
+            FormResponse.id,
+            FormResponse.status,
+            FormResponse.is_completed,
+            FormResponse.submitted_at,
+            ResponseFieldValue.field_id,
+            ResponseFieldValue.value,
+        )
+        .outerjoin(ResponseFieldValue, ResponseFieldValue.response_id == FormResponse.id)
+        .where(FormResponse.form_id == form.id)
+        .order_by(FormResponse.id)
+    )
+    result = session.execute(stmt, execution_options={"yield_per": batch_size})
+    try:
+        row: ResponseRow | None = None
+        for response_id, status, is_completed, submitted_at, field_id, value in result:
+            if row is None or row.response_id != response_id:
+                if row is not None:
+                    yield row
+                row = ResponseRow(response_id, status, bool(is_completed), submitted_at, [None] * len(columns))
+            if field_id in columns:
+                row.values[columns[field_id]] = value
+        if row is not None:
+            yield row
+    finally:
+        result.close()
+
+
+def iter_responses_csv(session: Session, form: Form, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Yield a CSV with one line per response of ``form`` and one column per field."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def _drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    fields = _export_fields(form)
+    writer.writerow(["Response ID", "Status", "Completed", "Submitted At", *(form_field.name for form_field in fields)])
+    yield _drain()
+
+    pending = 0
+    for row in iter_response_rows(session, form, batch_size):
+        writer.writerow(
+            [
+                row.response_id,
+                row.status.value if row.status is not None else "",
+                "yes" if row.is_completed else "no",
+                row.submitted_at.isoformat() if row.submitted_at else "",
+                *("" if value is None else value for value in row.values),
+            ]
+        )
+        pending += 1
+        if pending >= batch_size:
+            yield _drain()
+            pending = 0
+    yield _drain()
+
+
+COLUMNAR_FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+COLUMNAR_RESPONSE_COLUMNS = ("response_id", "status", "is_completed", "submitted_at")
+
+
+def _columnar_field_names(fields: list[FormField]) -> list[str]:
+    """Column names for ``fields``; a name shared with another field or a
+    response column is suffixed with the field ID (``"{name}__{id}"``)."""
+    counts = Counter(form_field.name for form_field in fields)
+    counts.update(COLUMNAR_RESPONSE_COLUMNS)
+    return [
+        form_field.name if counts[form_field.name] == 1 else f"{form_field.name}__{form_field.id}"
+        for form_field in fields
+    ]
+
+
+def build_columnar_export(
+    session: Session,
+    form: Form,
+    export_format: str = "parquet",
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> io.BytesIO:
+    """Write the responses of ``form`` as Parquet or an Arrow IPC stream.
+
+    Columns are typed per field: number fields become ``float64``, choice
+    fields are dictionary encoded and text fields stay strings. Rows are
+    converted one record batch at a time. Field names that would be ambiguous
+    are disambiguated by :func:`_columnar_field_names`.
+    """
+    if export_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format {export_format!r}")
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise ExportDependencyError("Columnar exports require the optional 'pyarrow' dependency") from exc
+
+    fields = _export_fields(form)
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    field_types = {
+        FieldType.number: pa.float64(),
+        FieldType.choice: dictionary,
+        FieldType.text: pa.string(),
+    }
+    schema = pa.schema(
+        [
+            pa.field("response_id", pa.int64(), nullable=False),
+            pa.field("status", dictionary),
+            pa.field("is_completed", pa.bool_()),
+            pa.field("submitted_at", pa.timestamp("us")),
+            *(
+                pa.field(name, field_types[form_field.field_type])
+                for name, form_field in zip(_columnar_field_names(fields), fields)
+            ),
+        ]
+    )
+    converters = [parse_numeric_value if form_field.field_type == FieldType.number else None for form_field in fields]
+
+    def _to_array(values: list[object], data_type):
+        if pa.types.is_dictionary(data_type):
+            return pa.array(values, pa.string()).dictionary_encode()
+        return pa.array(values, data_type)
+
+    def _record_batches() -> Iterator[object]:
+        batch: list[ResponseRow] = []
+        for row in iter_response_rows(session, form, batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield _record_batch(batch)
+                batch = []
+        if batch:
+            yield _record_batch(batch)
+
+    def _record_batch(rows: list[ResponseRow]):
+        columns: list[list[object]] = [
+            [row.response_id for row in rows],
+            [row.status.value if row.status is not None else None for row in rows],
+            [row.is_completed for row in rows],
+            [row.submitted_at for row in rows],
+        ]
+        for index, convert in enumerate(converters):
+            values = [row.values[index] for row in rows]
+            columns.append([convert(value) for value in values] if convert else values)
+        arrays = [_to_array(values, schema_field.type) for values, schema_field in zip(columns, schema)]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    buffer = io.BytesIO()
+    if export_format == "parquet":
+        with pq.ParquetWriter(buffer, schema) as writer:
+            for record_batch in _record_batches():
+                writer.write_batch(record_batch)
+    else:
+        with pa.ipc.new_stream(buffer, schema) as writer:
+            for record_batch in _record_batches():
+                writer.write_batch(record_batch)
+    buffer.seek(0)
+    return buffer
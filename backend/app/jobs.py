@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import enum
+import logging
+import os
+import tempfile
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Callable
+
+from .exports import build_csv_report, build_pdf_report
+from .reporting import FormReport
+
+logger = logging.getLogger(__name__)
+
+
+def _render_csv(report: FormReport) -> bytes:
+    return build_csv_report(report).getvalue().encode("utf-8")
+
+
+def _render_pdf(report: FormReport) -> bytes:
+    return build_pdf_report(report).getvalue()
+
+
+EXPORT_RENDERERS: dict[str, tuple[Callable[[FormReport], bytes], str]] = {
+    "csv": (_render_csv, "text/csv"),
+    "pdf": (_render_pdf, "application/pdf"),
+}
+
+
+class ExportJobStatus(str, enum.Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+@dataclass
+class ExportJob:
+    id: str
+    form_id: int
+    format: str
+    status: ExportJobStatus = ExportJobStatus.pending
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+    path: Path | None = None
+    error: str | None = None
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_RENDERERS[self.format][1]
+
+    @property
+    def filename(self) -> str:
+        return f"form-{self.form_id}-report.{self.format}"
+
+
+class ExportJobQueue:
+    """Compute and render report exports on a worker pool into an artifact directory.
+
+    Only the most recent ``max_jobs`` jobs are remembered; older jobs and their
+    artifacts are removed as new ones are submitted. A job evicted before it
+    starts is cancelled, and one evicted while running discards its artifact.
+    """
+
+    def __init__(self, artifact_dir: Path, executor: Executor | None = None, max_jobs: int = 1000):
+        self.artifact_dir = Path(artifact_dir)
+        self.executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-export")
+        self.max_jobs = max_jobs
+        self._lock = Lock()
+        self._jobs: OrderedDict[str, ExportJob] = OrderedDict()
+        self._futures: dict[str, Future] = {}
+
+    def submit(self, form_id: int, export_format: str, load_report: Callable[[], FormReport]) -> ExportJob:
+        """Queue an export; ``load_report`` runs on the worker, not the caller."""
+        if export_format not in EXPORT_RENDERERS:
+            raise ValueError(f"Unsupported export format {export_format!r}")
+        job = ExportJob(id=uuid.uuid4().hex, form_id=form_id, format=export_format)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self.executor.submit(self._run, job, load_report)
+            while len(self._jobs) > self.max_jobs:
+                _, expired = self._jobs.popitem(last=False)
+                future = self._futures.pop(expired.id, None)
+                if future is not None:
+                    future.cancel()
+                if expired.path is not None:
+                    expired.path.unlink(missing_ok=True)
+        return job
+
+    def get(self, job_id: str) -> ExportJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> ExportJob | None:
+        """Block until the job has finished; mainly useful for tests and scripts."""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout=timeout)
+        return self.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    def _run(self, job: ExportJob, load_report: Callable[[], FormReport]) -> None:
+        job.status = ExportJobStatus.running
+        render, _ = EXPORT_RENDERERS[job.format]
+        try:
+            content = render(load_report())
+            self.artifact_dir.mkdir(parents=True, exist_ok=True)
+            path = self.artifact_dir / f"{job.id}.{job.format}"
+            path.write_bytes(content)
+        except Exception as exc:
+            logger.exception("Export job %s for form %s failed", job.id, job.form_id)
+            job.error = str(exc)
+            job.status = ExportJobStatus.failed
+        else:
+            with self._lock:
+                if job.id in self._jobs:
+                    job.path = path
+                else:
+                    # Evicted while rendering; nobody can download it any more.
+                    path.unlink(missing_ok=True)
+            job.status = ExportJobStatus.completed
+        job.finished_at = datetime.utcnow()
+
+
+def configure_export_queue() -> ExportJobQueue:
+    default_dir = Path(tempfile.gettempdir()) / "dataentryforms-exports"
+    artifact_dir = Path(os.getenv("REPORT_EXPORT_DIR", str(default_dir)))
+    workers = int(os.getenv("REPORT_EXPORT_WORKERS", "2"))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-export")
+    return ExportJobQueue(artifact_dir, executor=executor)
@@ -1,35 +1,39 @@
 from __future__ import annotations
 
-from typing import Annotated
+from datetime import timedelta
+from typing import Annotated, Any, Iterator
 
-from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 
+from .cache import report_cache
 from .database import Base, engine, get_db
-from .reporting import get_form_report
+from .jobs import EXPORT_RENDERERS, ExportJob, ExportJobStatus, configure_export_queue
+from .models import Form
+from .reporting import FormReport, get_form_report
 from .schemas import FieldStatisticSchema, FormReportSchema, FormSummarySchema
 from .scheduler import configure_report_scheduler
 from .security import role_dependency
-from .exports import build_csv_report, build_pdf_report
+from .snapshots import get_fresh_report
+from .exports import (
+    COLUMNAR_FORMATS,
+    ExportDependencyError,
+    build_columnar_export,
+    build_csv_report,
+    build_pdf_report,
+    iter_responses_csv,
+)
 
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="Data Entry Forms Reporting")
 report_scheduler = configure_report_scheduler()
+export_jobs = configure_export_queue()
 
 
-@app.get("/reports/forms/{form_id}", response_model=FormReportSchema)
-def read_form_report(
-    form_id: int,
-    db: Annotated[Session, Depends(get_db)],
-    _: Annotated[str, Depends(role_dependency)],
-) -> FormReportSchema:
-    try:
-        report = get_form_report(db, form_id)
-    except ValueError as exc:  # pragma: no cover - defensive
-        raise HTTPException(status_code=404, detail=str(exc))
-    if report_scheduler:
-        report_scheduler.schedule_for_form(form_id)
+def _report_schema(report: FormReport) -> FormReportSchema:
     return FormReportSchema(
         form_id=report.form_id,
         form_name=report.form_name,
@@ -52,6 +56,33 @@ def read_form_report(
     )
 
 
+def _cached_report(db: Session, form_id: int) -> FormReport:
+    try:
+        return report_cache.get_or_compute(form_id, lambda: get_form_report(db, form_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
+@app.get("/reports/cache/stats")
+def read_report_cache_stats(_: Annotated[str, Depends(role_dependency)]) -> dict[str, Any]:
+    return report_cache.stats()
+
+
+@app.get("/reports/forms/{form_id}", response_model=FormReportSchema)
+def read_form_report(
+    form_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    _: Annotated[str, Depends(role_dependency)],
+    max_age: Annotated[int | None, Query(ge=0, description="Serve a stored snapshot up to this many seconds old")] = None,
+) -> FormReportSchema:
+    report = get_fresh_report(db, form_id, timedelta(seconds=max_age)) if max_age is not None else None
+    if report is None:
+        report = _cached_report(db, form_id)
+    if report_scheduler:
+        report_scheduler.schedule_for_form(form_id)
+    return _report_schema(report)
+
+
 @app.get("/reports/forms/{form_id}/export")
 def export_form_report(
     form_id: int,
@@ -59,18 +90,104 @@ def export_form_report(
     db: Annotated[Session, Depends(get_db)],
     _: Annotated[str, Depends(role_dependency)],
 ):
-    try:
-        report = get_form_report(db, form_id)
-    except ValueError as exc:
-        raise HTTPException(status_code=404, detail=str(exc))
+    if format in COLUMNAR_FORMATS:
+        form = db.get(Form, form_id)
+        if form is None:
+            raise HTTPException(status_code=404, detail=f"Form {form_id} not found")
+        try:
+            columnar_buffer = build_columnar_export(db, form, format)
+        except ExportDependencyError as exc:
+            raise HTTPException(status_code=501, detail=str(exc))
+        headers = {"Content-Disposition": f"attachment; filename=form-{form_id}-responses.{format}"}
+        return Response(content=columnar_buffer.getvalue(), media_type=COLUMNAR_FORMATS[format], headers=headers)
+
+    report = _cached_report(db, form_id)
 
     if format == "csv":
-        csv_buffer = build_csv_report(report)
+        csv_content = report_cache.get_or_compute(form_id, lambda: build_csv_report(report).getvalue(), kind="csv")
         headers = {"Content-Disposition": f"attachment; filename=form-{form_id}-report.csv"}
-        return Response(content=csv_buffer.getvalue(), media_type="text/csv", headers=headers)
+        return Response(content=csv_content, media_type="text/csv", headers=headers)
     if format == "pdf":
-        pdf_buffer = build_pdf_report(report)
+        pdf_content = report_cache.get_or_compute(form_id, lambda: build_pdf_report(report).getvalue(), kind="pdf")
         headers = {"Content-Disposition": f"attachment; filename=form-{form_id}-report.pdf"}
-        return Response(content=pdf_buffer.getvalue(), media_type="application/pdf", headers=headers)
+        return Response(content=pdf_content, media_type="application/pdf", headers=headers)
 
     raise HTTPException(status_code=400, detail="Unsupported format requested")
+
+
+def _stream_responses_csv(bind: Engine, form_id: int) -> Iterator[str]:
+    # The body is streamed after the endpoint returns, so it reads through its
+    # own session rather than the request-scoped one, which depending on the
+    # FastAPI version may already be closed.
+    with Session(bind) as session:
+        form = session.get(Form, form_id)
+        yield from iter_responses_csv(session, form)
+
+
+@app.get("/reports/forms/{form_id}/responses.csv")
+def export_form_responses(
+    form_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    _: Annotated[str, Depends(role_dependency)],
+) -> StreamingResponse:
+    form = db.get(Form, form_id)
+    if form is None:
+        raise HTTPException(status_code=404, detail=f"Form {form_id} not found")
+    headers = {"Content-Disposition": f"attachment; filename=form-{form_id}-responses.csv"}
+    return StreamingResponse(_stream_responses_csv(db.get_bind(), form_id), media_type="text/csv", headers=headers)
+
+
+def _export_job_payload(job: ExportJob) -> dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "form_id": job.form_id,
+        "format": job.format,
+        "status": job.status.value,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error,
+        "download_url": f"/reports/exports/{job.id}/download" if job.status == ExportJobStatus.completed else None,
+    }
+
+
+def _get_export_job(job_id: str) -> ExportJob:
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@app.post("/reports/forms/{form_id}/exports", status_code=202)
+def create_export_job(
+    form_id: int,
+    format: str,
+    db: Annotated[Session, Depends(get_db)],
+    _: Annotated[str, Depends(role_dependency)],
+) -> dict[str, Any]:
+    if format not in EXPORT_RENDERERS:
+        raise HTTPException(status_code=400, detail="Unsupported format requested")
+    if db.get(Form, form_id) is None:
+        raise HTTPException(status_code=404, detail=f"Form {form_id} not found")
+    bind = db.get_bind()
+
+    def load_report() -> FormReport:
+        # Runs on the export worker with its own session; the request session
+        # is closed by the time the job starts.
+        with Session(bind) as session:
+            return report_cache.get_or_compute(form_id, lambda: get_form_report(session, form_id))
+
+    job = export_jobs.submit(form_id, format, load_report)
+    return _export_job_payload(job)
+
+
+@app.get("/reports/exports/{job_id}")
+def read_export_job(job_id: str, _: Annotated[str, Depends(role_dependency)]) -> dict[str, Any]:
+    return _export_job_payload(_get_export_job(job_id))
+
+
+@app.get("/reports/exports/{job_id}/download")
+def download_export_job(job_id: str, _: Annotated[str, Depends(role_dependency)]) -> FileResponse:
+    job = _get_export_job(job_id)
+    if job.status != ExportJobStatus.completed or job.path is None:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status.value}")
+    return FileResponse(job.path, media_type=job.media_type, filename=job.filename)
@@ -0,0 +1,123 @@
+"""Idempotent schema upgrades for databases created by older releases.
+
+``Base.metadata.create_all`` only creates missing tables, so columns and
+indexes added to existing tables are applied here. Every step checks the live
+schema first and can be re-run safely against SQLite and PostgreSQL::
+
+    python -m backend.app.migrations
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Engine, bindparam, inspect, select, update
+from sqlalchemy.orm import Session
+
+from .aggregates import rebuild_all_form_aggregates
+from .database import Base, engine as default_engine
+from .models import FormField, FormResponse, ResponseFieldValue, typed_value_columns
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def add_typed_value_columns(engine: Engine) -> list[str]:
+    """Add the ``numeric_value``/``choice_value`` columns if missing."""
+    table = ResponseFieldValue.__table__
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    added: list[str] = []
+    with engine.begin() as connection:
+        for name in ("numeric_value", "choice_value"):
+            if name in existing:
+                continue
+            column_type = table.c[name].type.compile(dialect=engine.dialect)
+            connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+            added.append(name)
+    return added
+
+
+# Single-column indexes created by earlier releases that are prefixes of the
+# composite reporting indexes and only cost write amplification now.
+REDUNDANT_INDEXES = {
+    FormResponse.__tablename__: ("ix_form_responses_form_id",),
+    ResponseFieldValue.__tablename__: ("ix_response_field_values_response_id", "ix_response_field_values_field_id"),
+}
+
+
+def ensure_reporting_indexes(engine: Engine) -> dict[str, list[str]]:
+    """Create the composite reporting indexes and drop the ones they supersede."""
+    inspector = inspect(engine)
+    created: list[str] = []
+    dropped: list[str] = []
+    with engine.begin() as connection:
+        for table in (FormResponse.__table__, ResponseFieldValue.__table__):
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in existing:
+                    index.create(connection)
+                    created.append(index.name)
+            for name in REDUNDANT_INDEXES.get(table.name, ()):
+                if name in existing:
+                    connection.exec_driver_sql(f"DROP INDEX {engine.dialect.identifier_preparer.quote(name)}")
+                    dropped.append(name)
+    return {"created": created, "dropped": dropped}
+
+
+def backfill_typed_values(engine: Engine, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Populate the typed value columns of rows written before they existed.
+
+    Rows are walked in primary-key order one batch per transaction, so the
+    backfill can run on a live database and resume where it stopped.
+    """
+    select_stmt = (
+        select(ResponseFieldValue.id, ResponseFieldValue.value, FormField.field_type)
+        .join(FormField, FormField.id == ResponseFieldValue.field_id)
+        .where(ResponseFieldValue.numeric_value.is_(None))
+        .where(ResponseFieldValue.choice_value.is_(None))
+        .where(ResponseFieldValue.id > bindparam("after_id"))
+        .order_by(ResponseFieldValue.id)
+        .limit(batch_size)
+    )
+    update_stmt = (
+        update(ResponseFieldValue.__table__)
+        .where(ResponseFieldValue.__table__.c.id == bindparam("row_id"))
+        .values(numeric_value=bindparam("numeric"), choice_value=bindparam("choice"))
+    )
+    updated = 0
+    after_id = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(select_stmt, {"after_id": after_id}).all()
+            if not rows:
+                return updated
+            params = []
+            for row_id, value, field_type in rows:
+                numeric, choice = typed_value_columns(field_type, value)
+                if numeric is not None or choice is not None:
+                    params.append({"row_id": row_id, "numeric": numeric, "choice": choice})
+            if params:
+                connection.execute(update_stmt, params)
+            updated += len(params)
+            after_id = rows[-1][0]
+
+
+def migrate(engine: Engine = default_engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    added = add_typed_value_columns(engine)
+    if added:
+        logger.info("Added columns to response_field_values: %s", ", ".join(added))
+    indexes = ensure_reporting_indexes(engine)
+    logger.info("Created indexes %s; dropped indexes %s", indexes["created"], indexes["dropped"])
+    logger.info("Backfilled typed values for %s rows", backfill_typed_values(engine))
+    # Seed the materialised aggregates of existing forms from the backfilled
+    # values; afterwards only the scheduler's rebuild job reconciles forms
+    # that writes mark stale.
+    with Session(engine) as session, session.begin():
+        logger.info("Rebuilt report aggregates for %s forms", rebuild_all_form_aggregates(session))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate()
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import enum
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from .database import Base
 
@@ -48,7 +49,7 @@ class FormResponse(Base):
     __tablename__ = "form_responses"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
     submitted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     status: Mapped[ResponseStatus] = mapped_column(Enum(ResponseStatus), default=ResponseStatus.draft)
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -56,14 +57,120 @@ class FormResponse(Base):
     form: Mapped[Form] = relationship("Form", back_populates="responses")
     values: Mapped[list[ResponseFieldValue]] = relationship("ResponseFieldValue", back_populates="response", cascade="all, delete-orphan")
 
+    # Covers the report summary filter; also serves plain ``form_id`` lookups.
+    __table_args__ = (Index("ix_form_responses_form_status_completed", "form_id", "status", "is_completed"),)
+
 
 class ResponseFieldValue(Base):
     __tablename__ = "response_field_values"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    response_id: Mapped[int] = mapped_column(ForeignKey("form_responses.id", ondelete="CASCADE"), nullable=False, index=True)
-    field_id: Mapped[int] = mapped_column(ForeignKey("form_fields.id", ondelete="CASCADE"), nullable=False, index=True)
+    response_id: Mapped[int] = mapped_column(ForeignKey("form_responses.id", ondelete="CASCADE"), nullable=False)
+    field_id: Mapped[int] = mapped_column(ForeignKey("form_fields.id", ondelete="CASCADE"), nullable=False)
     value: Mapped[str] = mapped_column(Text, nullable=False)
+    # Typed copies of ``value`` kept in sync by ``_populate_typed_values`` so
+    # aggregates can run on indexable columns instead of casting text.
+    numeric_value: Mapped[float | None] = mapped_column(Float, nullable=True)
+    choice_value: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     response: Mapped[FormResponse] = relationship("FormResponse", back_populates="values")
     field: Mapped[FormField] = relationship("FormField", back_populates="values")
+
+    # Report aggregates join values from the completed responses of a form;
+    # the first index covers that join including the numeric statistics, the
+    # second serves per-field lookups.
+    __table_args__ = (
+        Index("ix_response_field_values_response_field_numeric", "response_id", "field_id", "numeric_value"),
+        Index("ix_response_field_values_field_response", "field_id", "response_id"),
+    )
+
+
+class ReportSnapshot(Base):
+    __tablename__ = "report_snapshots"
+    __table_args__ = (UniqueConstraint("form_id", "version", name="uq_report_snapshots_form_version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    generated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class FormReportAggregate(Base):
+    """Running response counters for a form, maintained on every flush."""
+
+    __tablename__ = "form_report_aggregates"
+
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), primary_key=True)
+    total_responses: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_responses: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    is_stale: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    rebuilt_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class FieldReportAggregate(Base):
+    """Running answered/numeric totals for a field over completed responses."""
+
+    __tablename__ = "field_report_aggregates"
+
+    field_id: Mapped[int] = mapped_column(ForeignKey("form_fields.id", ondelete="CASCADE"), primary_key=True)
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    answered_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    numeric_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    numeric_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    numeric_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    numeric_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class FieldChoiceAggregate(Base):
+    """Histogram bucket counting completed responses per choice value."""
+
+    __tablename__ = "field_choice_aggregates"
+
+    field_id: Mapped[int] = mapped_column(ForeignKey("form_fields.id", ondelete="CASCADE"), primary_key=True)
+    choice: Mapped[str] = mapped_column(Text, primary_key=True)
+    form_id: Mapped[int] = mapped_column(ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def parse_numeric_value(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def typed_value_columns(field_type: FieldType, value: str | None) -> tuple[float | None, str | None]:
+    """Return the ``(numeric_value, choice_value)`` pair stored for ``value``."""
+    if field_type == FieldType.number:
+        return parse_numeric_value(value), None
+    if field_type == FieldType.choice:
+        return None, value
+    return None, None
+
+
+@event.listens_for(Session, "before_flush")
+def _populate_typed_values(session: Session, flush_context: Any, instances: Any) -> None:
+    """Fill the typed value columns of new and edited field values."""
+    pending: list[ResponseFieldValue] = []
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, ResponseFieldValue):
+            continue
+        if obj in session.new or session.is_modified(obj, include_collections=False):
+            pending.append(obj)
+    if not pending:
+        return
+
+    field_types: dict[int, FieldType] = {}
+    unresolved = {obj.field_id for obj in pending if "field" not in obj.__dict__ and obj.field_id is not None}
+    if unresolved:
+        stmt = select(FormField.id, FormField.field_type).where(FormField.id.in_(unresolved))
+        field_types.update((field_id, field_type) for field_id, field_type in session.connection().execute(stmt))
+    for obj in pending:
+        form_field = obj.__dict__.get("field")
+        field_type = form_field.field_type if form_field is not None else field_types.get(obj.field_id)
+        if field_type is None:
+            continue
+        obj.numeric_value, obj.choice_value = typed_value_columns(field_type, obj.value)
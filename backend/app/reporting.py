@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy import Float, cast, func, select
 from sqlalchemy.orm import Session
 
-from .models import FieldType, Form, FormField, FormResponse, ResponseFieldValue, ResponseStatus
+from .aggregates import FieldAggregate, compute_form_aggregate, load_form_aggregate
+from .models import FieldType, Form
 
 
 @dataclass
@@ -35,54 +34,27 @@ class FormReport:
     fields: list[FieldStatistic]
 
 
-def _calculate_numeric_stats(session: Session, field: FormField, completed_response_ids: list[int]) -> dict[str, Any]:
-    numeric_values_stmt = (
-        select(
-            func.count(ResponseFieldValue.id),
-            func.avg(cast(ResponseFieldValue.value, Float)),
-            func.min(cast(ResponseFieldValue.value, Float)),
-            func.max(cast(ResponseFieldValue.value, Float)),
-        )
-        .where(ResponseFieldValue.field_id == field.id)
-        .where(ResponseFieldValue.response_id.in_(completed_response_ids))
-    )
-    count, avg, min_value, max_value = session.execute(numeric_values_stmt).one()
+def _numeric_statistics(aggregate: FieldAggregate) -> dict[str, Any]:
     return {
-        "count": int(count or 0),
-        "average": float(avg) if avg is not None else None,
-        "min": float(min_value) if min_value is not None else None,
-        "max": float(max_value) if max_value is not None else None,
+        "count": aggregate.answered_count,
+        "average": aggregate.average,
+        "min": aggregate.min_value,
+        "max": aggregate.max_value,
     }
 
 
-def _calculate_choice_stats(session: Session, field: FormField, completed_response_ids: list[int]) -> dict[str, Any]:
-    choice_stmt = (
-        select(ResponseFieldValue.value, func.count(ResponseFieldValue.id))
-        .where(ResponseFieldValue.field_id == field.id)
-        .where(ResponseFieldValue.response_id.in_(completed_response_ids))
-        .group_by(ResponseFieldValue.value)
-    )
-    distribution = {
-        choice: int(count)
-        for choice, count in session.execute(choice_stmt).all()
-    }
-    return {"distribution": distribution}
+def _choice_statistics(aggregate: FieldAggregate) -> dict[str, Any]:
+    return {"distribution": dict(aggregate.distribution)}
 
 
-def _calculate_text_stats(session: Session, field: FormField, completed_response_ids: list[int]) -> dict[str, Any]:
-    text_stmt = (
-        select(func.count(ResponseFieldValue.id))
-        .where(ResponseFieldValue.field_id == field.id)
-        .where(ResponseFieldValue.response_id.in_(completed_response_ids))
-    )
-    answered = session.execute(text_stmt).scalar() or 0
-    return {"count": int(answered)}
+def _text_statistics(aggregate: FieldAggregate) -> dict[str, Any]:
+    return {"count": aggregate.answered_count}
 
 
-_FIELD_STAT_CALCULATORS = {
-    FieldType.number: _calculate_numeric_stats,
-    FieldType.choice: _calculate_choice_stats,
-    FieldType.text: _calculate_text_stats,
+_FIELD_STAT_BUILDERS = {
+    FieldType.number: _numeric_statistics,
+    FieldType.choice: _choice_statistics,
+    FieldType.text: _text_statistics,
 }
 
 
@@ -91,44 +63,22 @@ def get_form_report(session: Session, form_id: int) -> FormReport:
     if form is None:
         raise ValueError(f"Form {form_id} not found")
 
-    total_responses_stmt = select(func.count(FormResponse.id)).where(FormResponse.form_id == form_id)
-    total_responses = session.execute(total_responses_stmt).scalar() or 0
-
-    completed_stmt = (
-        select(func.count(FormResponse.id), func.group_concat(FormResponse.id, ","))
-        .where(FormResponse.form_id == form_id)
-        .where(FormResponse.status == ResponseStatus.completed)
-        .where(FormResponse.is_completed.is_(True))
-    )
-    completed_count, completed_concat = session.execute(completed_stmt).one()
-    completed_responses = int(completed_count or 0)
-    completed_ids = (
-        [int(value) for value in completed_concat.split(",")] if completed_concat else []
-    )
-
+    aggregate = load_form_aggregate(session, form_id) or compute_form_aggregate(session, form_id)
+    total_responses = aggregate.total_responses
+    completed_responses = aggregate.completed_responses
     completion_rate = (completed_responses / total_responses) if total_responses else 0.0
 
     field_statistics: list[FieldStatistic] = []
-    answered_counts: dict[int, int] = defaultdict(int)
-    if completed_ids:
-        answered_stmt = (
-            select(ResponseFieldValue.field_id, func.count(ResponseFieldValue.id))
-            .where(ResponseFieldValue.response_id.in_(completed_ids))
-            .group_by(ResponseFieldValue.field_id)
-        )
-        for field_id, count in session.execute(answered_stmt).all():
-            answered_counts[int(field_id)] = int(count)
-
-    for field in form.fields:
-        stats_func = _FIELD_STAT_CALCULATORS[field.field_type]
-        statistics = stats_func(session, field, completed_ids)
-        answered = answered_counts.get(field.id, 0)
+    for form_field in form.fields:
+        field_aggregate = aggregate.fields.get(form_field.id) or FieldAggregate()
+        statistics = _FIELD_STAT_BUILDERS[form_field.field_type](field_aggregate)
+        answered = field_aggregate.answered_count
         response_rate = (answered / completed_responses) if completed_responses else 0.0
         field_statistics.append(
             FieldStatistic(
-                field_id=field.id,
-                name=field.name,
-                field_type=field.field_type,
+                field_id=form_field.id,
+                name=form_field.name,
+                field_type=form_field.field_type,
                 answered_count=answered,
                 response_rate=response_rate,
                 statistics=statistics,
@@ -136,7 +86,7 @@ def get_form_report(session: Session, form_id: int) -> FormReport:
         )
 
     summary = FormSummary(
-        total_responses=int(total_responses),
+        total_responses=total_responses,
         completed_responses=completed_responses,
         completion_rate=completion_rate,
     )
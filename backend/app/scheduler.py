@@ -6,8 +6,10 @@ from datetime import datetime
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from .aggregates import rebuild_all_form_aggregates
 from .database import session_scope
 from .reporting import get_form_report
+from .snapshots import save_report_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +41,30 @@ class ReportScheduler:
             replace_existing=True,
         )
 
+    def schedule_aggregate_rebuild(self, interval_minutes: int | None = None) -> None:
+        self.scheduler.add_job(
+            func=_rebuild_aggregates_job,
+            trigger="interval",
+            minutes=interval_minutes or self.interval_minutes,
+            id="report-aggregate-rebuild",
+            replace_existing=True,
+        )
+
+
+def _rebuild_aggregates_job() -> None:
+    logger.info("Reconciling materialised report aggregates at %s", datetime.utcnow())
+    with session_scope() as session:
+        rebuilt = rebuild_all_form_aggregates(session)
+    logger.info("Rebuilt report aggregates for %s forms", rebuilt)
+
 
 def _generate_report_job(form_id: int) -> None:
     logger.info("Generating scheduled report for form %s at %s", form_id, datetime.utcnow())
     with session_scope() as session:
         try:
             report = get_form_report(session, form_id)
-            logger.info("Generated report summary: %s", report.summary)
+            snapshot = save_report_snapshot(session, report)
+            logger.info("Stored report snapshot v%s: %s", snapshot.version, report.summary)
         except ValueError:
             logger.warning("Scheduled report skipped; form %s not found", form_id)
 
@@ -56,5 +75,7 @@ def configure_report_scheduler() -> ReportScheduler | None:
         return None
     interval = int(os.getenv("REPORT_SCHEDULER_INTERVAL", "60"))
     scheduler = ReportScheduler(interval_minutes=interval)
+    rebuild_interval = int(os.getenv("REPORT_AGGREGATE_REBUILD_INTERVAL", str(interval)))
+    scheduler.schedule_aggregate_rebuild(rebuild_interval)
     scheduler.start()
     return scheduler
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from .models import FieldType, ReportSnapshot
+from .reporting import FieldStatistic, FormReport, FormSummary
+
+SNAPSHOT_RETENTION = 5
+
+
+def report_to_payload(report: FormReport) -> dict[str, Any]:
+    return {
+        "form_id": report.form_id,
+        "form_name": report.form_name,
+        "summary": {
+            "total_responses": report.summary.total_responses,
+            "completed_responses": report.summary.completed_responses,
+            "completion_rate": report.summary.completion_rate,
+        },
+        "fields": [
+            {
+                "field_id": field.field_id,
+                "name": field.name,
+                "field_type": field.field_type.value,
+                "answered_count": field.answered_count,
+                "response_rate": field.response_rate,
+                "statistics": field.statistics,
+            }
+            for field in report.fields
+        ],
+    }
+
+
+def report_from_payload(payload: dict[str, Any]) -> FormReport:
+    return FormReport(
+        form_id=payload["form_id"],
+        form_name=payload["form_name"],
+        summary=FormSummary(**payload["summary"]),
+        fields=[
+            FieldStatistic(
+                field_id=field["field_id"],
+                name=field["name"],
+                field_type=FieldType(field["field_type"]),
+                answered_count=field["answered_count"],
+                response_rate=field["response_rate"],
+                statistics=field["statistics"],
+            )
+            for field in payload["fields"]
+        ],
+    )
+
+
+def save_report_snapshot(session: Session, report: FormReport) -> ReportSnapshot:
+    """Persist ``report`` as the next snapshot version for its form.
+
+    Only the most recent ``SNAPSHOT_RETENTION`` versions are kept.
+    """
+    latest_version = session.execute(
+        select(func.max(ReportSnapshot.version)).where(ReportSnapshot.form_id == report.form_id)
+    ).scalar()
+    snapshot = ReportSnapshot(
+        form_id=report.form_id,
+        version=int(latest_version or 0) + 1,
+        generated_at=datetime.utcnow(),
+        payload=json.dumps(report_to_payload(report)),
+    )
+    session.add(snapshot)
+    session.flush()
+    session.execute(
+        delete(ReportSnapshot)
+        .where(ReportSnapshot.form_id == report.form_id)
+        .where(ReportSnapshot.version <= snapshot.version - SNAPSHOT_RETENTION)
+    )
+    return snapshot
+
+
+def get_latest_snapshot(session: Session, form_id: int) -> ReportSnapshot | None:
+    stmt = (
+        select(ReportSnapshot)
+        .where(ReportSnapshot.form_id == form_id)
+        .order_by(ReportSnapshot.version.desc())
+        .limit(1)
+    )
+    return session.execute(stmt).scalar_one_or_none()
+
+
+def get_fresh_report(session: Session, form_id: int, max_age: timedelta) -> FormReport | None:
+    """Return the latest snapshot report if it is younger than ``max_age``."""
+    snapshot = get_latest_snapshot(session, form_id)
+    if snapshot is None or datetime.utcnow() - snapshot.generated_at > max_age:
+        return None
+    return report_from_payload(json.loads(snapshot.payload))
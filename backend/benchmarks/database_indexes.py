@@ -0,0 +1,52 @@
+"""Measure message and notification lookups as the in-memory store grows.
+
+Messages and notifications are spread over a fixed number of form responses
+and users, so each lookup returns roughly the same number of rows while the
+store grows. Indexed lookups should stay flat; the full scan they replaced is
+printed alongside for comparison::
+
+    python -m backend.benchmarks.database_indexes --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from backend.database import InMemoryDatabase
+
+
+def _per_call(fn: Callable[[int], object], keys: range, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for key in keys:
+            fn(key)
+    return (time.perf_counter() - started) / (repeat * len(keys))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--rows-per-key", type=int, default=20, help="rows returned by each lookup")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    db = InMemoryDatabase()
+    print(f"{'rows':>10} {'list_messages':>15} {'list_notifications':>19} {'full scan':>12}")
+    for size in sorted(args.sizes):
+        keys = max(1, size // args.rows_per_key)
+        while len(db.messages) < size:
+            count = len(db.messages)
+            db.add_message(form_response_id=count % keys + 1, author_id=1, body="benchmark")
+            db.add_notification(user_id=count % keys + 1, form_response_id=None, message="benchmark", notif_type="message")
+        sample = range(1, min(keys, args.lookups) + 1)
+        messages = _per_call(db.list_messages, sample, args.repeat)
+        notifications = _per_call(db.list_notifications, sample, args.repeat)
+        scan = _per_call(lambda key: [m for m in db.messages.values() if m.form_response_id == key], sample[:5], 1)
+        print(f"{size:>10} {messages * 1e6:>12.1f} us {notifications * 1e6:>16.1f} us {scan * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
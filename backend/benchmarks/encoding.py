@@ -0,0 +1,60 @@
+"""Compare response encoding paths for a large message thread.
+
+Times the previous path (build a dict per message, then ``json.dumps``)
+against encoding the ``Message`` dataclasses directly with each available
+backend of ``backend.encoding``::
+
+    python -m backend.benchmarks.encoding --messages 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from backend import encoding
+from backend.database import Message
+
+
+def _dict_then_json(messages: list[Message]) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": m.id,
+                "form_response_id": m.form_response_id,
+                "author_id": m.author_id,
+                "body": m.body,
+                "parent_id": m.parent_id,
+                "created_at": m.created_at.isoformat(),
+            }
+            for m in messages
+        ]
+    ).encode("utf-8")
+
+
+def _best_of(fn: Callable[[], bytes], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    messages = [Message(id=i, form_response_id=1, author_id=i % 7, body=f"Comment number {i}") for i in range(args.messages)]
+    print(f"dict + json.dumps: {_best_of(lambda: _dict_then_json(messages), args.repeat) * 1000:8.2f} ms")
+    for name in sorted(encoding.BACKENDS):
+        dumps, _ = encoding.BACKENDS[name]
+        print(f"{name + ' (direct)':>17}: {_best_of(lambda: dumps(messages), args.repeat) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
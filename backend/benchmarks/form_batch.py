@@ -0,0 +1,71 @@
+"""Compare creating and assigning form responses one call at a time with the batch endpoints.
+
+Drives the forms API in-process through FastAPI's ``TestClient``, so the
+numbers include request parsing and response encoding but no network::
+
+    python -m backend.benchmarks.form_batch --count 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from backend.forms_api import app, reset_state
+
+FORM_IDS = ("incident-report", "safety-audit")
+
+
+def _timed(run: Callable[[], None]) -> float:
+    reset_state()
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    reset_state()
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    client = TestClient(app)
+    items = [
+        {"form_id": FORM_IDS[index % len(FORM_IDS)], "user_id": f"user-{index % args.users}"}
+        for index in range(args.count)
+    ]
+
+    def single_creates() -> None:
+        for item in items:
+            client.post("/form-responses", json=item).raise_for_status()
+
+    def single_assigns() -> None:
+        for item in items:
+            client.post(f"/forms/{item['form_id']}/assign", json={"user_id": item["user_id"]}).raise_for_status()
+
+    def batch_creates() -> None:
+        client.post("/form-responses/batch", json=items).raise_for_status()
+
+    def batch_assigns() -> None:
+        client.post("/assignments/batch", json=items).raise_for_status()
+
+    print(f"{'operation':<12} {'single calls':>14} {'one batch':>12} {'speedup':>9}")
+    for name, single, batch in (
+        ("create", single_creates, batch_creates),
+        ("assign", single_assigns, batch_assigns),
+    ):
+        single_elapsed = _timed(single)
+        batch_elapsed = _timed(batch)
+        print(
+            f"{name:<12} {single_elapsed * 1e3:>11.0f} ms {batch_elapsed * 1e3:>9.0f} ms "
+            f"{single_elapsed / batch_elapsed:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
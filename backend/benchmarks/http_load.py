@@ -0,0 +1,102 @@
+"""Load-test ``backend.server`` in single-threaded and thread-pool modes.
+
+Each mode is started in-process on a free port with a seeded user, then
+``--clients`` threads issue ``--requests`` requests each over keep-alive
+connections. Requests/second and latency percentiles are printed per mode::
+
+    python -m backend.benchmarks.http_load --clients 32 --requests 200
+    python -m backend.benchmarks.http_load --modes threaded --workers 8 --no-keep-alive
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+
+from backend.database import get_db
+from backend.server import DEFAULT_WORKERS, make_server
+
+
+def _client(host: str, port: int, path: str, headers: dict[str, str], requests: int, keep_alive: bool, latencies: list[float], errors: list[int]) -> None:
+    connection = None
+    for _ in range(requests):
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = http.client.HTTPConnection(host, port, timeout=60)
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+            if not keep_alive or response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            if connection is not None:
+                connection.close()
+            connection = None
+        latencies.append(time.perf_counter() - started)
+    if connection is not None:
+        connection.close()
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_mode(mode: str, args: argparse.Namespace, user_id: int) -> None:
+    server = make_server("127.0.0.1", 0, mode=mode, workers=args.workers)
+    host, port = server.server_address[:2]
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+
+    headers = {"X-User-Id": str(user_id)}
+    if not args.keep_alive:
+        headers["Connection"] = "close"
+    latencies: list[float] = []
+    errors: list[int] = []
+    clients = [
+        threading.Thread(target=_client, args=(host, port, args.path, headers, args.requests, args.keep_alive, latencies, errors))
+        for _ in range(args.clients)
+    ]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    server.shutdown()
+    server.server_close()
+    print(
+        f"{mode:>9}: {len(latencies) / elapsed:8.0f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+        f"p99 {_percentile(latencies, 0.99) * 1000:7.2f} ms  "
+        f"errors {len(errors)}"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", choices=("single", "threaded"), default=["single", "threaded"])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--path", default="/notifications")
+    parser.add_argument("--no-keep-alive", dest="keep_alive", action="store_false")
+    args = parser.parse_args(argv)
+
+    user = get_db().add_user("load-test@example.com", "Load Test")
+    print(f"{args.clients} clients x {args.requests} requests, keep-alive {'on' if args.keep_alive else 'off'}")
+    for mode in args.modes:
+        run_mode(mode, args, user.id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Compare report aggregate query plans before and after the reporting indexes.
+
+Seeds a database with the single-column index layout of earlier releases,
+captures the statements issued by ``compute_form_aggregate`` and prints their
+plans and timings, then applies ``ensure_reporting_indexes`` and repeats::
+
+    python -m backend.benchmarks.report_query_plans --forms 20 --responses 20000
+    python -m backend.benchmarks.report_query_plans --database-url postgresql://...
+
+The target database is dropped and recreated, so never point it at real data.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, event, insert, text
+from sqlalchemy.orm import Session
+
+from backend.app.aggregates import compute_form_aggregate
+from backend.app.database import Base
+from backend.app.migrations import REDUNDANT_INDEXES, ensure_reporting_indexes
+from backend.app.models import (
+    FieldType,
+    Form,
+    FormField,
+    FormResponse,
+    ResponseFieldValue,
+    ResponseStatus,
+    typed_value_columns,
+)
+
+LEGACY_INDEX_COLUMNS = {
+    "ix_form_responses_form_id": "form_id",
+    "ix_response_field_values_response_id": "response_id",
+    "ix_response_field_values_field_id": "field_id",
+}
+CHOICES = ["Open", "Closed", "Pending", "Escalated"]
+
+
+def create_legacy_schema(engine: Engine) -> None:
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for table in (FormResponse.__table__, ResponseFieldValue.__table__):
+            for index in table.indexes:
+                if len(index.columns) > 1:
+                    index.drop(connection)
+            for name in REDUNDANT_INDEXES[table.name]:
+                connection.exec_driver_sql(f"CREATE INDEX {name} ON {table.name} ({LEGACY_INDEX_COLUMNS[name]})")
+
+
+def seed(engine: Engine, forms: int, responses: int, seed_value: int = 0) -> list[int]:
+    rng = random.Random(seed_value)
+    field_types = [FieldType.number, FieldType.number, FieldType.choice, FieldType.text]
+    statuses = list(ResponseStatus)
+    form_ids: list[int] = []
+    response_id = 0
+    with engine.begin() as connection:
+        for form_number in range(1, forms + 1):
+            connection.execute(insert(Form).values(id=form_number, name=f"Form {form_number}"))
+            form_ids.append(form_number)
+            fields = []
+            for offset, field_type in enumerate(field_types):
+                field_id = (form_number - 1) * len(field_types) + offset + 1
+                connection.execute(
+                    insert(FormField).values(id=field_id, form_id=form_number, name=f"Field {field_id}", field_type=field_type)
+                )
+                fields.append((field_id, field_type))
+            response_rows = []
+            value_rows = []
+            for _ in range(responses):
+                response_id += 1
+                status = rng.choice(statuses)
+                response_rows.append(
+                    {"id": response_id, "form_id": form_number, "status": status, "is_completed": status is ResponseStatus.completed}
+                )
+                for field_id, field_type in fields:
+                    if field_type is FieldType.number:
+                        value = str(rng.randint(0, 100))
+                    elif field_type is FieldType.choice:
+                        value = rng.choice(CHOICES)
+                    else:
+                        value = "free text"
+                    numeric, choice = typed_value_columns(field_type, value)
+                    value_rows.append(
+                        {"response_id": response_id, "field_id": field_id, "value": value, "numeric_value": numeric, "choice_value": choice}
+                    )
+            connection.execute(insert(FormResponse), response_rows)
+            connection.execute(insert(ResponseFieldValue), value_rows)
+    return form_ids
+
+
+def capture_statements(engine: Engine, form_id: int) -> list[tuple[str, Any]]:
+    statements: list[tuple[str, Any]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        with Session(engine) as session:
+            compute_form_aggregate(session, form_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return statements
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> list[str]:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).all()
+    if engine.dialect.name == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def time_aggregates(engine: Engine, form_ids: list[int], repeat: int) -> float:
+    with Session(engine) as session:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for form_id in form_ids:
+                compute_form_aggregate(session, form_id)
+        return (time.perf_counter() - started) / (repeat * len(form_ids))
+
+
+def report(label: str, engine: Engine, form_ids: list[int], repeat: int) -> float:
+    print(f"== {label}")
+    for number, (statement, parameters) in enumerate(capture_statements(engine, form_ids[0]), start=1):
+        print(f"-- query {number}")
+        for line in explain(engine, statement, parameters):
+            print(f"   {line}")
+    elapsed = time_aggregates(engine, form_ids, repeat)
+    print(f"compute_form_aggregate: {elapsed * 1000:.2f} ms per form")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite:///./report_query_plans.db")
+    parser.add_argument("--forms", type=int, default=20)
+    parser.add_argument("--responses", type=int, default=20000, help="responses per form")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    create_legacy_schema(engine)
+    form_ids = seed(engine, args.forms, args.responses)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+    before = report("legacy indexes", engine, form_ids, args.repeat)
+    changes = ensure_reporting_indexes(engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+    print(f"created {changes['created']}, dropped {changes['dropped']}")
+    after = report("reporting indexes", engine, form_ids, args.repeat)
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Measure ``App.handle`` dispatch cost as the number of routes grows.
+
+Registers ``N`` parameterised routes next to the real API and resolves a path
+that matches the last one. The compiled trie should stay flat, unlike the
+linear template scan it replaced, which is timed alongside for reference::
+
+    python -m backend.benchmarks.routing --routes 10 100 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Optional
+
+from backend.database import InMemoryDatabase
+from backend.main import App, Response
+
+
+def _ok(request: dict, headers: dict[str, str]) -> Response:
+    return Response(200, None)
+
+
+def _linear_match(routes: list[tuple[str, str, Callable]], method: str, path: str) -> Optional[Callable]:
+    path_parts = [part for part in path.strip("/").split("/") if part]
+    for registered_method, template, handler in routes:
+        template_parts = [part for part in template.strip("/").split("/") if part]
+        if registered_method != method or len(template_parts) != len(path_parts):
+            continue
+        for template_part, path_part in zip(template_parts, path_parts):
+            if template_part.startswith("{") and template_part.endswith("}"):
+                int(path_part)
+            elif template_part != path_part:
+                break
+        else:
+            return handler
+    return None
+
+
+def _per_call(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'routes':>8} {'trie':>10} {'linear':>10}")
+    for count in args.routes:
+        app = App(InMemoryDatabase())
+        for index in range(count):
+            app.route("GET", f"/collection-{index}/{{item_id}}/children")(_ok)
+        path = f"/collection-{count - 1}/42/children?limit=10"
+        trie = _per_call(lambda: app.handle("GET", path), args.iterations)
+        linear = _per_call(lambda: _linear_match(app.routes, "GET", path.partition("?")[0]), max(1, args.iterations // 10))
+        print(f"{count:>8} {trie * 1e6:>7.2f} us {linear * 1e6:>7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
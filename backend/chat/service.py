@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 from backend.chat.models import Message
 from backend.database import Database
@@ -38,5 +38,8 @@ class ChatService:
         )
         return message
 
-    def list_messages(self, form_response_id: int) -> List[Message]:
-        return sorted(self.db.list_messages(form_response_id), key=lambda m: m.created_at)
+    def list_messages(
+        self, form_response_id: int, *, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Message]:
+        # IDs are allocated in creation order, so ID order is chronological.
+        return self.db.list_messages(form_response_id, after_id=after_id, limit=limit)
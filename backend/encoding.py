@@ -0,0 +1,73 @@
+"""JSON encoding for API responses.
+
+``orjson`` is used when it is installed, otherwise the standard library.
+Both backends serialise dataclasses and datetimes directly, so handlers can
+return model objects instead of building intermediate dicts. The backend can
+be forced with the ``JSON_ENCODER`` environment variable (``orjson``/``json``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Tuple
+
+try:  # pragma: no cover - exercised only when orjson is installed
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+_FIELD_GETTERS: Dict[type, Tuple[Tuple[str, ...], Callable[[Any], Tuple[Any, ...]]]] = {}
+
+
+def _default(obj: Any) -> Any:
+    cached = _FIELD_GETTERS.get(type(obj))
+    if cached is None:
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        if not is_dataclass(obj) or isinstance(obj, type):
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        names = tuple(f.name for f in fields(obj))
+        getter = attrgetter(*names) if len(names) > 1 else (lambda value: tuple(getattr(value, name) for name in names))
+        cached = _FIELD_GETTERS[type(obj)] = (names, getter)
+    names, getter = cached
+    return dict(zip(names, getter(obj)))
+
+
+_stdlib_encoder = json.JSONEncoder(default=_default, separators=(",", ":"))
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return _stdlib_encoder.encode(obj).encode("utf-8")
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+BACKENDS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes | str], Any]]] = {
+    "json": (_stdlib_dumps, _stdlib_loads),
+}
+if orjson is not None:
+    # orjson handles dataclasses and datetimes natively; ``_default`` covers the rest.
+    BACKENDS["orjson"] = (lambda obj: orjson.dumps(obj, default=_default), orjson.loads)
+
+backend = "json"
+dumps, loads = BACKENDS["json"]
+
+
+def configure_encoder(name: str | None = None) -> str:
+    """Select the JSON backend by name, ``JSON_ENCODER`` or the fastest available."""
+    global backend, dumps, loads
+    name = name or os.getenv("JSON_ENCODER") or ("orjson" if "orjson" in BACKENDS else "json")
+    if name not in BACKENDS:
+        raise ValueError(f"JSON encoder {name!r} is not available; choose from {sorted(BACKENDS)}")
+    backend = name
+    dumps, loads = BACKENDS[name]
+    return name
+
+
+configure_encoder()
@@ -0,0 +1,525 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from fastapi import FastAPI, Header, HTTPException, Response
+
+
+@dataclass
+class FormField:
+    id: str
+    label: str
+    type: str
+    required: bool = False
+    options: Optional[List[str]] = None
+
+
+@dataclass
+class FormTemplate:
+    id: str
+    name: str
+    description: str
+    fields: List[FormField]
+    required_field_ids: FrozenSet[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.required_field_ids = frozenset(field.id for field in self.fields if field.required)
+
+
+@dataclass
+class FormAssignment:
+    form_id: str
+    user_id: str
+    response_id: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "form_id": self.form_id,
+            "user_id": self.user_id,
+            "response_id": self.response_id,
+        }
+
+
+@dataclass
+class FormResponse:
+    id: str
+    form_id: str
+    answers: Dict[str, Optional[str]] = field(default_factory=dict)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+    status: str = "Not Started"
+    progress: float = 0.0
+    # Number of required fields currently answered, and the required set it
+    # was counted against; internal bookkeeping that lets autosaves update
+    # progress from the patched keys alone.
+    completed_required: int = field(default=0, repr=False)
+    counted_required_ids: FrozenSet[str] = field(default=frozenset(), repr=False)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "form_id": self.form_id,
+            "answers": dict(self.answers),
+            "updated_at": self.updated_at.isoformat(),
+            "status": self.status,
+            "progress": self.progress,
+        }
+
+
+class ResponseIdAllocator:
+    """Hand out unique, sortable response IDs without taking a lock.
+
+    IDs look like ``resp-<start ms>-<worker>-<sequence>`` with fixed-width hex
+    parts. The start time is taken once when the allocator is created and the
+    sequence comes from ``itertools.count``, whose ``next`` is atomic in
+    CPython, so threads never block each other. The worker part keeps IDs
+    from separate processes apart: set ``FORM_RESPONSE_WORKER_ID`` to a
+    distinct value per process to rule out collisions, otherwise 32 random
+    bits are used (process IDs repeat across containers). IDs sort by process
+    start time, then worker, then allocation order, and are never reused.
+    """
+
+    MAX_WORKER_ID = 0xFFFFFFFF
+
+    def __init__(self, prefix: str = "resp", worker_id: Optional[int] = None, started_ms: Optional[int] = None):
+        if worker_id is None:
+            configured = os.getenv("FORM_RESPONSE_WORKER_ID")
+            worker_id = int(configured) if configured else secrets.randbits(32)
+        if not 0 <= worker_id <= self.MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {self.MAX_WORKER_ID}")
+        if started_ms is None:
+            started_ms = time.time_ns() // 1_000_000
+        self._base = f"{prefix}-{started_ms:011x}-{worker_id:08x}-"
+        self._sequence = itertools.count(1)
+
+    def allocate(self, count: int = 1) -> List[str]:
+        base = self._base
+        return [f"{base}{number:08x}" for number in itertools.islice(self._sequence, count)]
+
+    def __call__(self) -> str:
+        return f"{self._base}{next(self._sequence):08x}"
+
+
+app = FastAPI(title="Data Entry Forms API")
+
+# Largest number of items accepted by the batch endpoints in one request.
+MAX_BATCH_SIZE = 10_000
+
+FORMS: Dict[str, FormTemplate] = {}
+FORM_RESPONSES: Dict[str, FormResponse] = {}
+ASSIGNMENTS: Dict[str, FormAssignment] = {}
+# Secondary indexes over ASSIGNMENTS: response IDs per user and per form, kept
+# in assignment order (dicts used as ordered sets). Maintained by _assign.
+ASSIGNMENTS_BY_USER: Dict[str, Dict[str, None]] = {}
+ASSIGNMENTS_BY_FORM: Dict[str, Dict[str, None]] = {}
+
+allocate_response_id = ResponseIdAllocator()
+
+# Pre-serialised GET /forms/{id} bodies and their ETags, plus the GET /forms
+# body (rebuilt lazily). Change templates through register_form so these stay
+# in step with FORMS; it bumps _FORMS_GENERATION so a list body built from the
+# previous templates is never stored.
+_FORM_PAYLOADS: Dict[str, Tuple[bytes, str]] = {}
+_FORM_LIST_PAYLOAD: Optional[Tuple[bytes, str]] = None
+_FORMS_GENERATION = 0
+_FORM_PAYLOAD_LOCK = Lock()
+
+# Autosaves of the same response are serialised so a counter update is never
+# lost; responses hash onto a fixed set of lock stripes so unrelated autosaves
+# do not wait on each other.
+RESPONSE_LOCK_STRIPES = 64
+_RESPONSE_LOCKS = [Lock() for _ in range(RESPONSE_LOCK_STRIPES)]
+_ASSIGNMENT_LOCK = Lock()
+
+
+def _template_dict(form: FormTemplate) -> Dict[str, object]:
+    return {
+        "id": form.id,
+        "name": form.name,
+        "description": form.description,
+        "fields": [asdict(field) for field in form.fields],
+    }
+
+
+def _encode_payload(payload: object) -> Tuple[bytes, str]:
+    body = json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+    return body, f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def _response_lock(response_id: str) -> Lock:
+    return _RESPONSE_LOCKS[hash(response_id) % RESPONSE_LOCK_STRIPES]
+
+
+def _recount(response: FormResponse, template: FormTemplate) -> None:
+    """Recount a response's progress from scratch; the caller holds its lock."""
+    response.completed_required = _count_completed(template, response.answers)
+    response.counted_required_ids = template.required_field_ids
+    response.progress = _progress_ratio(template, response.completed_required)
+    response.status = _response_status(response.progress)
+
+
+def register_form(form: FormTemplate) -> None:
+    """Add or replace a template and refresh its cached payloads.
+
+    Replacing a template with a different set of required fields recounts the
+    answered required fields of its existing responses, since autosaves only
+    adjust that counter for the keys they change.
+    """
+    global _FORM_LIST_PAYLOAD, _FORMS_GENERATION
+    previous = FORMS.get(form.id)
+    FORMS[form.id] = form
+    if previous is not None and previous.required_field_ids != form.required_field_ids:
+        for response in list(FORM_RESPONSES.values()):
+            if response.form_id == form.id:
+                with _response_lock(response.id):
+                    if FORMS.get(form.id) is form:
+                        _recount(response, form)
+    payload = _encode_payload(_template_dict(form))
+    with _FORM_PAYLOAD_LOCK:
+        _FORM_PAYLOADS[form.id] = payload
+        _FORMS_GENERATION += 1
+        _FORM_LIST_PAYLOAD = None
+
+
+def _form_list_payload() -> Tuple[bytes, str]:
+    global _FORM_LIST_PAYLOAD
+    with _FORM_PAYLOAD_LOCK:
+        cached = _FORM_LIST_PAYLOAD
+        generation = _FORMS_GENERATION
+    if cached is not None:
+        return cached
+    payload = _encode_payload([_template_dict(form) for form in list(FORMS.values())])
+    with _FORM_PAYLOAD_LOCK:
+        if generation == _FORMS_GENERATION:
+            _FORM_LIST_PAYLOAD = payload
+    return payload
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cached_json(payload: Tuple[bytes, str], if_none_match: Optional[str]) -> Response:
+    body, etag = payload
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _bootstrap_forms() -> None:
+    if FORMS:
+        return
+    register_form(
+        FormTemplate(
+            id="incident-report",
+            name="Incident Report",
+            description="Document workplace incidents with follow up actions.",
+            fields=[
+                FormField(id="incident_date", label="Incident Date", type="date", required=True),
+                FormField(id="location", label="Location", type="text", required=True),
+                FormField(id="description", label="Description", type="textarea", required=True),
+                FormField(id="follow_up", label="Follow Up", type="textarea", required=False),
+            ],
+        )
+    )
+    register_form(
+        FormTemplate(
+            id="safety-audit",
+            name="Safety Audit",
+            description="Routine audit of safety equipment.",
+            fields=[
+                FormField(id="auditor", label="Auditor", type="text", required=True),
+                FormField(id="audit_date", label="Audit Date", type="date", required=True),
+                FormField(id="issues_found", label="Issues Found", type="textarea", required=False),
+            ],
+        )
+    )
+
+
+_bootstrap_forms()
+
+
+def reset_state() -> None:
+    """Utility used by tests to clear in-memory response and assignment state."""
+    FORM_RESPONSES.clear()
+    ASSIGNMENTS.clear()
+    ASSIGNMENTS_BY_USER.clear()
+    ASSIGNMENTS_BY_FORM.clear()
+
+
+def _is_answered(value: object) -> bool:
+    return value not in (None, "")
+
+
+def _count_completed(template: FormTemplate, answers: Mapping[str, Optional[str]]) -> int:
+    return sum(1 for field_id in template.required_field_ids if _is_answered(answers.get(field_id)))
+
+
+def _progress_ratio(template: FormTemplate, completed: int) -> float:
+    if not template.required_field_ids:
+        return 1.0
+    return completed / len(template.required_field_ids)
+
+
+def _calculate_progress(form_id: str, answers: Dict[str, Optional[str]]) -> float:
+    template = FORMS.get(form_id)
+    if not template:
+        raise KeyError(form_id)
+    return _progress_ratio(template, _count_completed(template, answers))
+
+
+def _response_status(progress: float) -> str:
+    if progress <= 0:
+        return "Not Started"
+    if progress < 1:
+        return "In Progress"
+    return "Complete"
+
+
+def _assign_many(entries: Iterable[Tuple[str, str, str]]) -> List[FormAssignment]:
+    """Record ``(form_id, user_id, response_id)`` assignments and keep the
+    per-user and per-form indexes in step."""
+    assignments = [
+        FormAssignment(form_id=form_id, user_id=user_id, response_id=response_id)
+        for form_id, user_id, response_id in entries
+    ]
+    with _ASSIGNMENT_LOCK:
+        for assignment in assignments:
+            response_id = assignment.response_id
+            previous = ASSIGNMENTS.get(response_id)
+            if previous is not None and previous.user_id != assignment.user_id:
+                previous_ids = ASSIGNMENTS_BY_USER.get(previous.user_id, {})
+                previous_ids.pop(response_id, None)
+                if not previous_ids:
+                    ASSIGNMENTS_BY_USER.pop(previous.user_id, None)
+            ASSIGNMENTS[response_id] = assignment
+            ASSIGNMENTS_BY_USER.setdefault(assignment.user_id, {})[response_id] = None
+            ASSIGNMENTS_BY_FORM.setdefault(assignment.form_id, {})[response_id] = None
+    return assignments
+
+
+def _assign(form_id: str, user_id: str, response_id: str) -> FormAssignment:
+    return _assign_many([(form_id, user_id, response_id)])[0]
+
+
+def _assignment_summaries(response_ids: List[str]) -> List[Dict[str, object]]:
+    assignments: List[Dict[str, object]] = []
+    for response_id in response_ids:
+        assignment = ASSIGNMENTS.get(response_id)
+        response = FORM_RESPONSES.get(response_id)
+        if not assignment or not response:
+            continue
+        form = FORMS.get(assignment.form_id)
+        if not form:
+            continue
+        assignments.append(
+            {
+                "form_id": assignment.form_id,
+                "form_name": form.name,
+                "response_id": response.id,
+                "status": response.status,
+                "progress": response.progress,
+            }
+        )
+    return assignments
+
+
+def _create_responses(form_ids: List[str]) -> List[FormResponse]:
+    """Create empty responses for already validated form IDs in one step."""
+    initial: Dict[str, Tuple[int, float, FrozenSet[str]]] = {}
+    for form_id in form_ids:
+        if form_id not in initial:
+            template = FORMS[form_id]
+            completed = _count_completed(template, {})
+            initial[form_id] = (completed, _progress_ratio(template, completed), template.required_field_ids)
+    now = datetime.utcnow()
+    responses = []
+    for response_id, form_id in zip(allocate_response_id.allocate(len(form_ids)), form_ids):
+        completed, progress, required_field_ids = initial[form_id]
+        responses.append(
+            FormResponse(
+                id=response_id,
+                form_id=form_id,
+                answers={},
+                updated_at=now,
+                status=_response_status(progress),
+                progress=progress,
+                completed_required=completed,
+                counted_required_ids=required_field_ids,
+            )
+        )
+    FORM_RESPONSES.update((response.id, response) for response in responses)
+    return responses
+
+
+def _check_batch_size(payload: List[Dict[str, object]]) -> None:
+    if len(payload) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batches are limited to {MAX_BATCH_SIZE} items")
+
+
+def _validate_form_ids(form_ids: Iterable[object]) -> None:
+    checked = set()
+    for form_id in form_ids:
+        if not isinstance(form_id, str):
+            raise HTTPException(status_code=404, detail=f"Form not found: {form_id}")
+        if form_id not in checked:
+            if form_id not in FORMS:
+                raise HTTPException(status_code=404, detail=f"Form not found: {form_id}")
+            checked.add(form_id)
+
+
+def _ensure_response(response_id: str) -> FormResponse:
+    response = FORM_RESPONSES.get(response_id)
+    if not response:
+        raise HTTPException(status_code=404, detail="Response not found")
+    return response
+
+
+@app.get("/forms")
+def list_forms(if_none_match: Optional[str] = Header(default=None)) -> Response:
+    return _cached_json(_form_list_payload(), if_none_match)
+
+
+@app.get("/forms/{form_id}")
+def get_form(form_id: str, if_none_match: Optional[str] = Header(default=None)) -> Response:
+    payload = _FORM_PAYLOADS.get(form_id)
+    if not payload:
+        raise HTTPException(status_code=404, detail="Form not found")
+    return _cached_json(payload, if_none_match)
+
+
+@app.post("/form-responses", status_code=201)
+def create_form_response(payload: Dict[str, object]) -> Dict[str, object]:
+    form_id = payload.get("form_id")
+    user_id = payload.get("user_id")
+    if not isinstance(form_id, str) or form_id not in FORMS:
+        raise HTTPException(status_code=404, detail="Form not found")
+    response = _create_responses([form_id])[0]
+
+    if isinstance(user_id, str) and user_id:
+        _assign(form_id, user_id, response.id)
+
+    return response.to_dict()
+
+
+@app.post("/form-responses/batch", status_code=201)
+def create_form_responses(payload: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    """Create one response per ``{form_id, user_id}`` item, assigning it when
+    ``user_id`` is given. Nothing is created unless every form exists."""
+    _check_batch_size(payload)
+    form_ids = [item.get("form_id") for item in payload]
+    _validate_form_ids(form_ids)
+    responses = _create_responses(form_ids)
+    _assign_many(
+        (response.form_id, user_id, response.id)
+        for response, user_id in zip(responses, (item.get("user_id") for item in payload))
+        if isinstance(user_id, str) and user_id
+    )
+    return [response.to_dict() for response in responses]
+
+
+@app.get("/form-responses/{response_id}")
+def get_form_response(response_id: str) -> Dict[str, object]:
+    response = _ensure_response(response_id)
+    return response.to_dict()
+
+
+@app.patch("/form-responses/{response_id}")
+def patch_form_response(response_id: str, payload: Dict[str, object]) -> Dict[str, object]:
+    response = _ensure_response(response_id)
+    answers_payload = payload.get("answers") or {}
+    if not isinstance(answers_payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid answers payload")
+
+    answers = response.answers
+    with _response_lock(response_id):
+        template = FORMS.get(response.form_id)
+        if not template:
+            raise HTTPException(status_code=404, detail="Form not found")
+        required = template.required_field_ids
+        if response.counted_required_ids is not required:
+            # The template was replaced and register_form has not recounted
+            # this response yet.
+            _recount(response, template)
+        completed = response.completed_required
+        for field_id, value in answers_payload.items():
+            if field_id in required:
+                completed += _is_answered(value) - _is_answered(answers.get(field_id))
+            answers[field_id] = value
+        progress = _progress_ratio(template, completed)
+        response.completed_required = completed
+        response.progress = progress
+        response.status = _response_status(progress)
+        response.updated_at = datetime.utcnow()
+        return response.to_dict()
+
+
+@app.post("/forms/{form_id}/assign")
+def assign_form(form_id: str, payload: Dict[str, object]) -> Dict[str, str]:
+    if form_id not in FORMS:
+        raise HTTPException(status_code=404, detail="Form not found")
+    user_id = payload.get("user_id")
+    if not isinstance(user_id, str) or not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required")
+    response_id = payload.get("response_id")
+
+    if isinstance(response_id, str):
+        response = FORM_RESPONSES.get(response_id)
+        if not response or response.form_id != form_id:
+            raise HTTPException(status_code=404, detail="Response not found for form")
+        return _assign(form_id, user_id, response_id).to_dict()
+
+    created = create_form_response({"form_id": form_id})
+    return _assign(form_id, user_id, created["id"]).to_dict()
+
+
+@app.post("/assignments/batch")
+def assign_forms(payload: List[Dict[str, object]]) -> List[Dict[str, str]]:
+    """Apply ``{form_id, user_id[, response_id]}`` assignments in one call.
+
+    Items without a ``response_id`` get a new response. The whole batch is
+    validated before anything is written.
+    """
+    _check_batch_size(payload)
+    _validate_form_ids(item.get("form_id") for item in payload)
+    new_form_ids: List[str] = []
+    for item in payload:
+        user_id = item.get("user_id")
+        if not isinstance(user_id, str) or not user_id:
+            raise HTTPException(status_code=400, detail="user_id is required")
+        response_id = item.get("response_id")
+        if response_id is None:
+            new_form_ids.append(item["form_id"])
+            continue
+        response = FORM_RESPONSES.get(response_id) if isinstance(response_id, str) else None
+        if not response or response.form_id != item["form_id"]:
+            raise HTTPException(status_code=404, detail=f"Response not found for form: {response_id}")
+
+    new_ids = iter([response.id for response in _create_responses(new_form_ids)])
+    assignments = _assign_many(
+        (item["form_id"], item["user_id"], item.get("response_id") or next(new_ids)) for item in payload
+    )
+    return [assignment.to_dict() for assignment in assignments]
+
+
+@app.get("/users/{user_id}/assignments")
+def get_user_assignments(user_id: str) -> List[Dict[str, object]]:
+    return _assignment_summaries(list(ASSIGNMENTS_BY_USER.get(user_id, ())))
+
+
+@app.get("/forms/{form_id}/assignments")
+def get_form_assignments(form_id: str) -> List[Dict[str, object]]:
+    if form_id not in FORMS:
+        raise HTTPException(status_code=404, detail="Form not found")
+    return _assignment_summaries(list(ASSIGNMENTS_BY_FORM.get(form_id, ())))
@@ -1,92 +1,146 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from datetime import datetime
 from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
 
+from backend import encoding
 from backend.auth import AuthError, authenticate
 from backend.chat.service import ChatService
-from backend.database import Database, FormResponse, Message, get_db
+from backend.database import ConcurrentUpdateError, Database, FormResponse, get_db
 from backend.models import FormStatusEnum
-from backend.notifications import NotificationService
+from backend.notifications import DEFAULT_PAGE_SIZE, NotificationService
 from backend.realtime import ConnectionManager
 
 
+MAX_PAGE_SIZE = 200
+
+
 class Response:
-    def __init__(self, status_code: int, body: dict[str, object] | list[dict[str, object]] | None = None):
+    """Handler result; ``body`` may hold dataclasses and datetimes, see ``backend.encoding``."""
+
+    def __init__(self, status_code: int, body: object = None):
         self.status_code = status_code
         self.body = body
 
+    def encode(self) -> bytes:
+        return encoding.dumps(self.body)
+
     def json(self) -> dict[str, object] | list[dict[str, object]] | None:
-        return self.body
+        """Return the body as plain JSON data, exactly as a client would see it."""
+        if self.body is None:
+            return None
+        return encoding.loads(self.encode())
+
+
+def _int_converter(segment: str) -> Optional[int]:
+    return int(segment) if segment.isascii() and segment.isdigit() else None
+
+
+def _str_converter(segment: str) -> Optional[str]:
+    return segment
+
+
+# ``{name}`` defaults to ``int`` because every ID in the API is numeric.
+PATH_CONVERTERS: Dict[str, Callable[[str], Optional[object]]] = {"int": _int_converter, "str": _str_converter}
+
+
+class _RouteNode:
+    """One path segment of the compiled route trie."""
+
+    __slots__ = ("static", "params", "handlers")
+
+    def __init__(self) -> None:
+        self.static: Dict[str, _RouteNode] = {}
+        self.params: List[Tuple[str, Callable[[str], Optional[object]], _RouteNode]] = []
+        self.handlers: Dict[str, Callable[[dict, dict], Response]] = {}
+
+
+def _split_path(path: str) -> List[str]:
+    return [part for part in path.split("?", 1)[0].strip("/").split("/") if part]
 
 
 class App:
     def __init__(self, db: Database):
         self.db = db
         self.routes: List[Tuple[str, str, Callable[[dict, dict], Response]]] = []
+        self._route_tree = _RouteNode()
         self.connections = ConnectionManager()
 
     def route(self, method: str, path: str):
         def decorator(func: Callable[[dict, dict], Response]):
             self.routes.append((method.upper(), path, func))
+            self._compile_route(method.upper(), path, func)
             return func
 
         return decorator
 
+    def _compile_route(self, method: str, template: str, handler: Callable[[dict, dict], Response]) -> None:
+        node = self._route_tree
+        for part in _split_path(template):
+            if part.startswith("{") and part.endswith("}"):
+                name, _, converter_name = part[1:-1].partition(":")
+                converter = PATH_CONVERTERS[converter_name or "int"]
+                for existing_name, existing_converter, child in node.params:
+                    if existing_name == name and existing_converter is converter:
+                        node = child
+                        break
+                else:
+                    child = _RouteNode()
+                    node.params.append((name, converter, child))
+                    node = child
+            else:
+                node = node.static.setdefault(part, _RouteNode())
+        if method in node.handlers:
+            raise ValueError(f"Route {method} {template} is already registered")
+        node.handlers[method] = handler
+
     def handle(self, method: str, path: str, *, headers: Optional[dict[str, str]] = None, body: Optional[dict] = None) -> Response:
         headers = headers or {}
-        for registered_method, registered_path, handler in self.routes:
-            params = self._match_path(registered_path, path)
-            if params is not None and registered_method == method.upper():
-                request = {"params": params, "body": body or {}, "headers": headers}
-                return handler(request, headers)
-        return Response(404, {"detail": "Not found"})
-
-    def _match_path(self, template: str, path: str) -> Optional[Dict[str, int]]:
-        template_parts = [part for part in template.strip("/").split("/") if part]
-        path_parts = [part for part in path.strip("/").split("/") if part]
-        if len(template_parts) != len(path_parts):
+        match = self._resolve(method.upper(), path)
+        if match is None:
+            return Response(404, {"detail": "Not found"})
+        handler, params = match
+        _, _, query_string = path.partition("?")
+        query = {key: values[-1] for key, values in parse_qs(query_string).items()} if query_string else {}
+        request = {"params": params, "query": query, "body": body or {}, "headers": headers}
+        return handler(request, headers)
+
+    def _resolve(self, method: str, path: str) -> Optional[Tuple[Callable[[dict, dict], Response], Dict[str, object]]]:
+        """Walk the route trie; static segments win over parameters."""
+        segments = _split_path(path)
+        params: Dict[str, object] = {}
+
+        def walk(node: _RouteNode, index: int) -> Optional[Callable[[dict, dict], Response]]:
+            if index == len(segments):
+                return node.handlers.get(method)
+            segment = segments[index]
+            child = node.static.get(segment)
+            if child is not None:
+                handler = walk(child, index + 1)
+                if handler is not None:
+                    return handler
+            for name, converter, child in node.params:
+                value = converter(segment)
+                if value is None:
+                    continue
+                params[name] = value
+                handler = walk(child, index + 1)
+                if handler is not None:
+                    return handler
+                del params[name]
             return None
-        params: Dict[str, int] = {}
-        for template_part, path_part in zip(template_parts, path_parts):
-            if template_part.startswith("{") and template_part.endswith("}"):
-                key = template_part.strip("{}");
-                params[key] = int(path_part)
-            elif template_part != path_part:
-                return None
-        return params
-
-
-def serialize_form(form: FormResponse) -> dict[str, object]:
-    return {
-        "id": form.id,
-        "form_id": form.form_id,
-        "data": form.data,
-        "status": form.status,
-        "created_by_id": form.created_by_id,
-        "assigned_user_id": form.assigned_user_id,
-        "created_at": form.created_at.isoformat(),
-        "updated_at": form.updated_at.isoformat(),
-    }
-
-
-def serialize_message(message: Message) -> dict[str, object]:
-    return {
-        "id": message.id,
-        "form_response_id": message.form_response_id,
-        "author_id": message.author_id,
-        "body": message.body,
-        "parent_id": message.parent_id,
-        "created_at": message.created_at.isoformat(),
-    }
+
+        handler = walk(self._route_tree, 0)
+        return None if handler is None else (handler, params)
 
 
 def create_app() -> App:
     db = get_db()
     app = App(db)
-    notifier = NotificationService(db)
     connections = app.connections
+    notifier = NotificationService(db, connections)
 
     @app.route("POST", "/form-responses")
     def create_form_response(request: dict, headers: dict[str, str]) -> Response:
@@ -97,7 +151,7 @@ def create_app() -> App:
 
         payload = request["body"]
         form = db.add_form_response(payload["form_id"], payload.get("data", {}), current_user.id)
-        return Response(201, serialize_form(form))
+        return Response(201, form)
 
     @app.route("GET", "/form-responses/{form_response_id}")
     def get_form_response(request: dict, headers: dict[str, str]) -> Response:
@@ -111,7 +165,7 @@ def create_app() -> App:
             return Response(exc.status_code, {"detail": exc.detail})
         if not user_has_access(current_user.id, current_user.is_admin, form):
             return Response(403, {"detail": "Not authorized"})
-        return Response(200, serialize_form(form))
+        return Response(200, form)
 
     @app.route("PATCH", "/form-responses/{form_response_id}")
     def update_form_response(request: dict, headers: dict[str, str]) -> Response:
@@ -127,20 +181,38 @@ def create_app() -> App:
             return Response(403, {"detail": "Not authorized"})
 
         payload = request["body"]
+        stored = form
+        # Work on a copy so the stored response is only replaced through the
+        # compare-and-set in ``update_form_response``; clients may send the
+        # ``version`` they read to detect lost updates across requests.
+        try:
+            version = version_param(payload, default=stored.version)
+        except ValueError as exc:
+            return Response(400, {"detail": str(exc)})
+        form = replace(stored, version=version)
+        status_changed = False
+        assignee = None
         if "status" in payload and payload["status"]:
             status_value = payload["status"]
             if status_value not in {item.value for item in FormStatusEnum}:
                 return Response(400, {"detail": "Invalid status"})
             form.status = status_value
-            notifier.notify_status_change(form, current_user)
+            status_changed = True
         if "assigned_user_id" in payload and payload["assigned_user_id"] is not None:
             assignee = db.get_user(int(payload["assigned_user_id"]))
             if assignee is None:
                 return Response(400, {"detail": "Unknown assignee"})
             form.assigned_user_id = assignee.id
+        try:
+            db.update_form_response(form)
+        except ConcurrentUpdateError as exc:
+            return Response(409, {"detail": str(exc)})
+        if status_changed:
+            # Status notifications go to the assignee the change was made under.
+            notifier.notify_status_change(replace(form, assigned_user_id=stored.assigned_user_id), current_user)
+        if assignee is not None:
             notifier.notify_assignment(form, assignee, current_user)
-        db.update_form_response(form)
-        return Response(200, serialize_form(form))
+        return Response(200, form)
 
     @app.route("POST", "/form-responses/{form_response_id}/messages")
     def post_message(request: dict, headers: dict[str, str]) -> Response:
@@ -158,7 +230,7 @@ def create_app() -> App:
         payload = request["body"]
         chat_service = ChatService(db, notifier, connections)
         message = chat_service.create_message(form.id, current_user.id, payload["body"], payload.get("parent_id"))
-        return Response(201, serialize_message(message))
+        return Response(201, message)
 
     @app.route("GET", "/form-responses/{form_response_id}/messages")
     def list_messages(request: dict, headers: dict[str, str]) -> Response:
@@ -173,9 +245,12 @@ def create_app() -> App:
         if not user_has_access(current_user.id, current_user.is_admin, form):
             return Response(403, {"detail": "Not authorized"})
 
+        try:
+            after_id, limit = page_params(request["query"])
+        except ValueError as exc:
+            return Response(400, {"detail": str(exc)})
         chat_service = ChatService(db, notifier, connections)
-        messages = [serialize_message(m) for m in chat_service.list_messages(form.id)]
-        return Response(200, messages)
+        return Response(200, chat_service.list_messages(form.id, after_id=after_id, limit=limit))
 
     @app.route("GET", "/notifications")
     def get_notifications(request: dict, headers: dict[str, str]) -> Response:
@@ -183,7 +258,11 @@ def create_app() -> App:
             current_user = authenticate(db, headers)
         except AuthError as exc:
             return Response(exc.status_code, {"detail": exc.detail})
-        summary = notifier.unread_summary(current_user.id)
+        try:
+            after_id, limit = page_params(request["query"], default_limit=DEFAULT_PAGE_SIZE)
+        except ValueError as exc:
+            return Response(400, {"detail": str(exc)})
+        summary = notifier.unread_summary(current_user.id, limit=limit, after_id=after_id)
         return Response(200, summary)
 
     @app.route("POST", "/notifications/{notification_id}/read")
@@ -201,6 +280,32 @@ def create_app() -> App:
     return app
 
 
+def page_params(query: dict[str, str], *, default_limit: Optional[int] = None) -> Tuple[Optional[int], Optional[int]]:
+    """Parse the ``after_id`` cursor and ``limit`` (capped at ``MAX_PAGE_SIZE``) query parameters."""
+    values: Dict[str, Optional[int]] = {"after_id": None, "limit": default_limit}
+    for name in values:
+        raw = query.get(name)
+        if raw is None:
+            continue
+        if not (raw.isascii() and raw.isdigit()):
+            raise ValueError(f"{name} must be a non-negative integer")
+        values[name] = int(raw)
+    limit = values["limit"]
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return values["after_id"], limit
+
+
+def version_param(payload: dict, *, default: int) -> int:
+    """Parse the optional ``version`` a client sends back for compare-and-set."""
+    raw = payload.get("version", default)
+    if isinstance(raw, str) and raw.isascii() and raw.isdigit():
+        return int(raw)
+    if isinstance(raw, bool) or not isinstance(raw, int) or raw < 0:
+        raise ValueError("version must be a non-negative integer")
+    return raw
+
+
 def user_has_access(user_id: int, is_admin: bool, form: FormResponse) -> bool:
     return is_admin or form.created_by_id == user_id or form.assigned_user_id == user_id
 
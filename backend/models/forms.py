@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy import JSON, Column, DateTime, Integer, String
 
-from backend.database import Base
+from backend.orm import Base
 
 
 class FormTemplate(Base):
@@ -1,38 +1,69 @@
 from __future__ import annotations
 
-from typing import Set
+from typing import Iterable, Optional, Set
 
 from backend.chat.models import Message
 from backend.database import Database, FormResponse, Notification, User, get_db
 from backend.models import NotificationType
+from backend.realtime import ConnectionManager, user_topic
+
+DEFAULT_PAGE_SIZE = 50
+
+# Rendered with the event context when a notification is read, so a fan-out
+# stores one context per event instead of one formatted string per recipient.
+MESSAGE_TEMPLATES = {
+    NotificationType.ASSIGNMENT.value: "You have been assigned to form response #{form_response_id} by {triggered_by}.",
+    NotificationType.STATUS_CHANGE.value: "Form response #{form_response_id} status changed to {status} by {triggered_by}.",
+    NotificationType.MESSAGE.value: "New comment on form response #{form_response_id}.",
+}
+
+
+def render_message(notification: Notification) -> str:
+    if notification.message is not None:
+        return notification.message
+    return MESSAGE_TEMPLATES[notification.type].format_map(notification.context)
 
 
 class NotificationService:
-    def __init__(self, db: Database) -> None:
+    def __init__(self, db: Database, connections: Optional[ConnectionManager] = None) -> None:
         self.db = db
+        self.connections = connections
+
+    def _fan_out(self, recipients: Iterable[int], form_response: FormResponse, notif_type: NotificationType, **context: object) -> None:
+        context["form_response_id"] = form_response.id
+        notifications = self.db.add_notifications(sorted(recipients), form_response.id, notif_type.value, context)
+        if self.connections is None:
+            return
+        for notification in notifications:
+            topic = user_topic(notification.user_id)
+            if not self.connections.subscriber_count(topic):
+                continue
+            self.connections.publish(
+                topic,
+                {
+                    "event": "notification_created",
+                    "notification": self._serialize_notification(notification),
+                    "unread_count": self.db.count_unread_notifications(notification.user_id),
+                },
+            )
 
     def notify_assignment(self, form_response: FormResponse, assigned_to: User, triggered_by: User) -> None:
         if assigned_to.id == triggered_by.id:
             return
-        self.db.add_notification(
-            user_id=assigned_to.id,
-            form_response_id=form_response.id,
-            message=f"You have been assigned to form response #{form_response.id} by {triggered_by.full_name}.",
-            notif_type=NotificationType.ASSIGNMENT.value,
-        )
+        self._fan_out([assigned_to.id], form_response, NotificationType.ASSIGNMENT, triggered_by=triggered_by.full_name)
 
     def notify_status_change(self, form_response: FormResponse, triggered_by: User) -> None:
         recipients: Set[int] = {form_response.created_by_id}
         if form_response.assigned_user_id:
             recipients.add(form_response.assigned_user_id)
         recipients.discard(triggered_by.id)
-        for recipient in recipients:
-            self.db.add_notification(
-                user_id=recipient,
-                form_response_id=form_response.id,
-                message=f"Form response #{form_response.id} status changed to {form_response.status} by {triggered_by.full_name}.",
-                notif_type=NotificationType.STATUS_CHANGE.value,
-            )
+        self._fan_out(
+            recipients,
+            form_response,
+            NotificationType.STATUS_CHANGE,
+            status=form_response.status,
+            triggered_by=triggered_by.full_name,
+        )
 
     def notify_message(self, message: Message) -> None:
         form_response = self.db.get_form_response(message.form_response_id)
@@ -44,26 +75,29 @@ class NotificationService:
         for prior in self.db.list_messages(form_response.id):
             recipients.add(prior.author_id)
         recipients.discard(message.author_id)
-        for recipient in recipients:
-            self.db.add_notification(
-                user_id=recipient,
-                form_response_id=form_response.id,
-                message=f"New comment on form response #{form_response.id}.",
-                notif_type=NotificationType.MESSAGE.value,
-            )
+        self._fan_out(recipients, form_response, NotificationType.MESSAGE)
+
+    def unread_summary(
+        self, user_id: int, *, limit: int = DEFAULT_PAGE_SIZE, after_id: Optional[int] = None
+    ) -> dict[str, object]:
+        """Return the unread count and one page of the newest-first feed.
 
-    def unread_summary(self, user_id: int) -> dict[str, object]:
-        notifications = sorted(self.db.list_notifications(user_id), key=lambda n: n.created_at, reverse=True)
-        unread = sum(1 for n in notifications if not n.is_read)
+        Pass the returned ``next_after_id`` as ``after_id`` to fetch the next
+        (older) page; it is ``None`` on the last page.
+        """
+        page = self.db.list_notifications(user_id, after_id=after_id, limit=limit + 1, newest_first=True)
+        has_more = len(page) > limit
+        items = page[:limit]
         return {
-            "unread_count": unread,
-            "items": [self._serialize_notification(n) for n in notifications],
+            "unread_count": self.db.count_unread_notifications(user_id),
+            "items": [self._serialize_notification(n) for n in items],
+            "next_after_id": items[-1].id if has_more else None,
         }
 
     def _serialize_notification(self, notification: Notification) -> dict[str, object]:
         return {
             "id": notification.id,
-            "message": notification.message,
+            "message": render_message(notification),
             "type": notification.type,
             "form_response_id": notification.form_response_id,
             "is_read": notification.is_read,
@@ -1,19 +1,170 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Any, Deque, Dict, List
+import enum
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+DEFAULT_MAX_QUEUE = 256
+
+
+class OverflowPolicy(str, enum.Enum):
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
+
+
+def form_response_topic(form_response_id: int) -> Tuple[str, int]:
+    return ("form_response", form_response_id)
+
+
+def user_topic(user_id: int) -> Tuple[str, int]:
+    return ("user", user_id)
+
+
+class Subscription:
+    """A subscriber's bounded event queue.
+
+    Events are delivered with :meth:`drain`. ``notify`` is called after every
+    delivery (and once when the subscription closes) so that consumers living
+    on another thread or event loop can wake up; it must not block.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        topics: Tuple[Hashable, ...],
+        max_queue: int,
+        overflow: OverflowPolicy,
+        notify: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.manager = manager
+        self.topics = topics
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.notify = notify
+        self.dropped = 0
+        self.closed = False
+        self._events: Deque[dict[str, Any]] = deque()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def drain(self) -> List[dict[str, Any]]:
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def close(self) -> None:
+        self.manager.unsubscribe(self)
+
+    def _offer(self, payload: dict[str, Any]) -> bool:
+        """Queue ``payload``; return ``False`` if the subscriber must be disconnected."""
+        with self._lock:
+            if self.closed:
+                return True
+            if len(self._events) >= self.max_queue:
+                if self.overflow is OverflowPolicy.DISCONNECT:
+                    return False
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(payload)
+        if self.notify is not None:
+            self.notify()
+        return True
 
 
 class ConnectionManager:
-    """Simple event queue to emulate WebSocket broadcasts for tests."""
+    """Fan chat and notification events out to subscribers of a topic.
 
-    def __init__(self) -> None:
-        self.events: Dict[int, Deque[dict[str, Any]]] = defaultdict(deque)
+    Topics are hashable keys such as :func:`form_response_topic` or
+    :func:`user_topic`. Nothing is retained for a topic without subscribers,
+    and a topic is forgotten as soon as its last subscriber leaves. Each
+    subscriber has its own bounded queue; when it is full the ``overflow``
+    policy either drops the oldest event or disconnects the slow subscriber.
+    """
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST) -> None:
+        self.max_queue = max_queue
+        self.overflow = OverflowPolicy(overflow)
+        self._lock = Lock()
+        self._topics: Dict[Hashable, Set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.disconnected = 0
+        self._dropped_by_closed = 0
+
+    def subscribe(
+        self,
+        *topics: Hashable,
+        max_queue: Optional[int] = None,
+        overflow: Optional[OverflowPolicy] = None,
+        notify: Optional[Callable[[], None]] = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            self,
+            topics,
+            max_queue or self.max_queue,
+            OverflowPolicy(overflow or self.overflow),
+            notify,
+        )
+        with self._lock:
+            for topic in topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            self._dropped_by_closed += subscription.dropped
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is None:
+                    continue
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+        if subscription.notify is not None:
+            subscription.notify()
+
+    def publish(self, topic: Hashable, payload: dict[str, Any]) -> int:
+        """Deliver ``payload`` to the topic's subscribers and return how many got it."""
+        with self._lock:
+            self.published += 1
+            subscribers = tuple(self._topics.get(topic, ()))
+        delivered = 0
+        for subscription in subscribers:
+            if subscription._offer(payload):
+                delivered += 1
+            else:
+                with self._lock:
+                    self.disconnected += 1
+                self.unsubscribe(subscription)
+        with self._lock:
+            self.delivered += delivered
+        return delivered
 
     def queue_broadcast(self, form_response_id: int, payload: dict[str, Any]) -> None:
-        self.events[form_response_id].append(payload)
+        self.publish(form_response_topic(form_response_id), payload)
+
+    def subscriber_count(self, topic: Hashable) -> int:
+        with self._lock:
+            return len(self._topics.get(topic, ()))
 
-    def drain_events(self, form_response_id: int) -> List[dict[str, Any]]:
-        result: List[dict[str, Any]] = list(self.events[form_response_id])
-        self.events[form_response_id].clear()
-        return result
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            subscriptions = {subscription for subscribers in self._topics.values() for subscription in subscribers}
+            depths = [len(subscription) for subscription in subscriptions]
+            return {
+                "topics": len(self._topics),
+                "subscribers": len(subscriptions),
+                "queued_events": sum(depths),
+                "max_queue_depth": max(depths, default=0),
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": self._dropped_by_closed + sum(subscription.dropped for subscription in subscriptions),
+                "disconnected": self.disconnected,
+            }
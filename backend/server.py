@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-import json
+import argparse
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Dict
 
-from backend.main import app
+from backend import encoding
+from backend.main import app, user_has_access
+from backend.sse import DEFAULT_SSE_PORT, EventStreamGateway
+
+DEFAULT_WORKERS = 16
+DEFAULT_MAX_PENDING = 64
+KEEP_ALIVE_TIMEOUT = 5.0
 
 
 class RequestHandler(BaseHTTPRequestHandler):
     protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections are closed after this many seconds so they
+    # do not pin a worker thread forever.
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body are written separately; without TCP_NODELAY the body
+    # of a keep-alive response waits on the client's delayed ACK.
+    disable_nagle_algorithm = True
 
     def do_GET(self) -> None:  # noqa: N802
         self._handle("GET")
@@ -25,15 +40,23 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type, X-User-Id")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, OPTIONS")
         self.send_header("Content-Length", "0")
+        self._send_connection_header()
         self.end_headers()
 
     def log_message(self, format: str, *args) -> None:  # noqa: A003
         return
 
+    def _send_connection_header(self) -> None:
+        """Ask keep-alive clients to reconnect elsewhere once shutdown has begun."""
+        stopping = getattr(self.server, "stopping", None)
+        if stopping is not None and stopping.is_set():
+            self.send_header("Connection", "close")
+            self.close_connection = True
+
     def _handle(self, method: str) -> None:
         length = int(self.headers.get("Content-Length", 0))
         raw_body = self.rfile.read(length) if length else b""
-        body = json.loads(raw_body.decode("utf-8")) if raw_body else None
+        body = encoding.loads(raw_body) if raw_body else None
         headers = {k: v for k, v in self.headers.items()}
         response = app.handle(method, self.path, body=body, headers=headers)
         self.send_response(response.status_code)
@@ -41,26 +64,126 @@ class RequestHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Headers", "Content-Type, X-User-Id")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, OPTIONS")
         self.send_header("Content-Type", "application/json")
+        self._send_connection_header()
         if response.body is None:
             self.send_header("Content-Length", "0")
             self.end_headers()
             return
-        payload = json.dumps(response.body).encode("utf-8")
+        payload = response.encode()
         self.send_header("Content-Length", str(len(payload)))
         self.end_headers()
         self.wfile.write(payload)
 
 
-def run(host: str = "127.0.0.1", port: int = 8000) -> None:
-    server = HTTPServer((host, port), RequestHandler)
-    print(f"Serving on http://{host}:{port}")
+class ThreadPoolHTTPServer(HTTPServer):
+    """HTTP server that serves connections on a bounded pool of worker threads.
+
+    At most ``workers`` connections are served at once and up to
+    ``max_pending`` more wait for a free worker; beyond that the listener stops
+    accepting and further clients queue in the kernel backlog. ``server_close``
+    waits for in-flight requests to finish.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        *,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-worker")
+        self.stopping = threading.Event()
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def process_request(self, request, client_address) -> None:
+        while not self._slots.acquire(timeout=0.5):
+            if self.stopping.is_set():
+                self.shutdown_request(request)
+                return
+        self.executor.submit(self._process_request_in_worker, request, client_address)
+
+    def _process_request_in_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        self.stopping.set()
+        super().shutdown()
+
+    def server_close(self) -> None:
+        self.stopping.set()
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    mode: str = "threaded",
+    workers: int = DEFAULT_WORKERS,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> HTTPServer:
+    if mode == "single":
+        return HTTPServer((host, port), RequestHandler)
+    if mode == "threaded":
+        return ThreadPoolHTTPServer((host, port), RequestHandler, workers=workers, max_pending=max_pending)
+    raise ValueError(f"Unknown server mode {mode!r}")
+
+
+def run(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    mode: str = "threaded",
+    workers: int = DEFAULT_WORKERS,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    sse_port: int = DEFAULT_SSE_PORT,
+) -> None:
+    server = make_server(host, port, mode=mode, workers=workers, max_pending=max_pending)
+    gateway = None
+    if sse_port:
+        gateway = EventStreamGateway(app.db, app.connections, user_has_access)
+        gateway.start_in_thread(host, sse_port)
+
+    def _stop(signum, frame) -> None:
+        # ``shutdown`` blocks until ``serve_forever`` returns, so it cannot run
+        # on the thread that is serving.
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, _stop)
+    print(f"Serving on http://{host}:{port} ({mode}, {workers if mode == 'threaded' else 1} workers)")
+    if gateway is not None:
+        print(f"Streaming events on http://{host}:{sse_port}/events")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
+        if gateway is not None:
+            gateway.stop_in_thread()
         server.server_close()
 
 
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the form-response and messaging API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--mode", choices=("threaded", "single"), default="threaded")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="worker threads in threaded mode")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="accepted connections waiting for a worker")
+    parser.add_argument("--sse-port", type=int, default=DEFAULT_SSE_PORT, help="Server-Sent Events port; 0 disables the stream")
+    args = parser.parse_args(argv)
+    run(args.host, args.port, mode=args.mode, workers=args.workers, max_pending=args.max_pending, sse_port=args.sse_port)
+
+
 if __name__ == "__main__":
-    run()
+    main()
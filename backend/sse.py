@@ -0,0 +1,204 @@
+"""Server-Sent Events gateway for realtime chat and notification events.
+
+A single asyncio event loop serves every stream, so idle connections cost one
+coroutine and one :class:`~backend.realtime.Subscription` each rather than a
+worker thread. Browsers connect with ``EventSource``, which cannot send custom
+headers, so the user is given as a query parameter::
+
+    GET /events?user_id=3&form_response_id=1&form_response_id=2
+
+The stream carries the user's notification events plus ``message_created``
+events for every listed form response the user may access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backend import encoding
+from backend.database import Database, FormResponse
+from backend.realtime import ConnectionManager, form_response_topic, user_topic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SSE_PORT = 8002
+HEARTBEAT_SECONDS = 15.0
+MAX_REQUEST_HEAD = 8192
+REQUEST_TIMEOUT = 10.0
+
+
+class EventStreamGateway:
+    def __init__(
+        self,
+        db: Database,
+        connections: ConnectionManager,
+        has_access: Callable[[int, bool, FormResponse], bool],
+        *,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> None:
+        self.db = db
+        self.connections = connections
+        self.has_access = has_access
+        self.heartbeat = heartbeat
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._streams: set[asyncio.Task] = set()
+        self._ready = threading.Event()
+
+    @property
+    def open_streams(self) -> int:
+        return len(self._streams)
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_SSE_PORT) -> asyncio.AbstractServer:
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._ready.set()
+        return self._server
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for task in list(self._streams):
+            task.cancel()
+        await asyncio.gather(*self._streams, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = DEFAULT_SSE_PORT) -> threading.Thread:
+        """Run the gateway on its own event loop in a daemon thread."""
+
+        def _run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.start(host, port))
+            try:
+                loop.run_forever()
+            finally:
+                loop.run_until_complete(self.close())
+                loop.close()
+
+        thread = threading.Thread(target=_run, name="sse-gateway", daemon=True)
+        thread.start()
+        self._ready.wait()
+        return thread
+
+    def stop_in_thread(self) -> None:
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._streams.add(task)
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), REQUEST_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                return
+            if len(head) > MAX_REQUEST_HEAD:
+                await self._reply(writer, 431, {"detail": "Request header too large"})
+                return
+            request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+            parts = request_line.split(" ")
+            if len(parts) != 3:
+                await self._reply(writer, 400, {"detail": "Malformed request"})
+                return
+            method, target, _ = parts
+            url = urlsplit(target)
+            if method == "OPTIONS":
+                await self._reply(writer, 204, None)
+                return
+            if method != "GET" or url.path.rstrip("/") != "/events":
+                await self._reply(writer, 404, {"detail": "Not found"})
+                return
+            status, detail, topics = self._resolve_topics(parse_qs(url.query))
+            if status != 200:
+                await self._reply(writer, status, {"detail": detail})
+                return
+            await self._stream(writer, topics)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._streams.discard(task)
+            writer.close()
+
+    def _resolve_topics(self, query: dict[str, List[str]]) -> Tuple[int, str, List[Any]]:
+        try:
+            user_id = int(query.get("user_id", [""])[-1])
+            form_response_ids = [int(value) for value in query.get("form_response_id", [])]
+        except ValueError:
+            return 400, "user_id and form_response_id must be integers", []
+        user = self.db.get_user(user_id)
+        if user is None:
+            return 401, "Unknown user", []
+        topics: List[Any] = [user_topic(user.id)]
+        for form_response_id in form_response_ids:
+            form = self.db.get_form_response(form_response_id)
+            if form is None:
+                return 404, f"Form response #{form_response_id} not found", []
+            if not self.has_access(user.id, user.is_admin, form):
+                return 403, "Not authorized", []
+            topics.append(form_response_topic(form.id))
+        return 200, "", topics
+
+    async def _stream(self, writer: asyncio.StreamWriter, topics: List[Any]) -> None:
+        wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        # Publishers run on HTTP worker threads; hop onto the loop to wake us.
+        subscription = self.connections.subscribe(*topics, notify=lambda: loop.call_soon_threadsafe(wakeup.set))
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Connection: keep-alive\r\n"
+                b"Access-Control-Allow-Origin: *\r\n"
+                b"\r\n"
+                b"retry: 3000\n\n"
+            )
+            await writer.drain()
+            while True:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                wakeup.clear()
+                events = subscription.drain()
+                if events:
+                    writer.write(b"".join(_format_event(event) for event in events))
+                    await writer.drain()
+                if subscription.closed:
+                    return
+        finally:
+            subscription.close()
+
+    async def _reply(self, writer: asyncio.StreamWriter, status: int, body: object) -> None:
+        payload = b"" if body is None else encoding.dumps(body)
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            "Access-Control-Allow-Origin: *\r\n"
+            "Access-Control-Allow-Headers: Content-Type\r\n"
+            "Access-Control-Allow-Methods: GET, OPTIONS\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        await writer.drain()
+
+
+_REASONS = {204: "No Content", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found", 431: "Request Header Fields Too Large"}
+
+
+def _format_event(payload: dict[str, Any]) -> bytes:
+    name = payload.get("event", "message")
+    return b"event: " + str(name).encode("utf-8") + b"\ndata: " + encoding.dumps(payload) + b"\n\n"
@@ -4,15 +4,28 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from backend.app.cache import report_cache
 from backend.app.database import Base, get_db
 from backend.app.main import app
 from backend.app.models import FieldType, Form, FormField, FormResponse, ResponseFieldValue, ResponseStatus
 
 
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    report_cache.clear()
+    yield
+    report_cache.clear()
+
+
 @pytest.fixture()
 def engine():
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, select
+
+from backend.app.aggregates import (
+    compute_form_aggregate,
+    load_form_aggregate,
+    rebuild_all_form_aggregates,
+)
+from backend.app.models import FormReportAggregate, FormResponse, ResponseFieldValue, ResponseStatus
+from backend.app.reporting import get_form_report
+from backend.app.scheduler import configure_report_scheduler
+
+
+def _response(db_session, form_id: int, status: ResponseStatus) -> FormResponse:
+    return db_session.execute(
+        select(FormResponse).where(FormResponse.form_id == form_id).where(FormResponse.status == status)
+    ).scalars().first()
+
+
+def test_writes_keep_materialised_aggregates_in_sync(db_session, seeded_data):
+    form = seeded_data["form"]
+
+    materialised = load_form_aggregate(db_session, form.id)
+    assert materialised == compute_form_aggregate(db_session, form.id)
+    assert materialised.completed_responses == 2
+    assert materialised.fields[seeded_data["fields"]["number"].id].numeric_sum == 12.0
+
+
+def test_completing_a_response_folds_in_its_values(db_session, seeded_data):
+    form = seeded_data["form"]
+    fields = seeded_data["fields"]
+    submitted = _response(db_session, form.id, ResponseStatus.submitted)
+    db_session.add_all(
+        [
+            ResponseFieldValue(response_id=submitted.id, field_id=fields["number"].id, value="2"),
+            ResponseFieldValue(response_id=submitted.id, field_id=fields["choice"].id, value="Open"),
+        ]
+    )
+    db_session.commit()
+    assert load_form_aggregate(db_session, form.id).completed_responses == 2
+
+    submitted.status = ResponseStatus.completed
+    submitted.is_completed = True
+    db_session.commit()
+
+    materialised = load_form_aggregate(db_session, form.id)
+    assert materialised == compute_form_aggregate(db_session, form.id)
+    number_stats = materialised.fields[fields["number"].id]
+    assert (number_stats.min_value, number_stats.max_value, number_stats.numeric_count) == (2.0, 7.0, 3)
+    assert materialised.fields[fields["choice"].id].distribution == {"Open": 2, "Closed": 1}
+
+
+def test_choice_edits_are_applied_incrementally(db_session, seeded_data):
+    form = seeded_data["form"]
+    choice_value = db_session.execute(
+        select(ResponseFieldValue).where(ResponseFieldValue.value == "Open")
+    ).scalar_one()
+    choice_value.value = "Closed"
+    db_session.commit()
+
+    materialised = load_form_aggregate(db_session, form.id)
+    assert materialised is not None
+    assert materialised.fields[seeded_data["fields"]["choice"].id].distribution == {"Closed": 2}
+
+
+def test_numeric_removal_falls_back_until_commit_rebuilds(db_session, seeded_data):
+    form = seeded_data["form"]
+    number_value = db_session.execute(select(ResponseFieldValue).where(ResponseFieldValue.value == "7")).scalar_one()
+    number_value.value = "1"
+    db_session.flush()
+
+    assert load_form_aggregate(db_session, form.id) is None
+    number_stats = next(field for field in get_form_report(db_session, form.id).fields if field.name == "Hazards Found")
+    assert (number_stats.statistics["min"], number_stats.statistics["max"]) == (1.0, 5.0)
+
+    db_session.commit()
+    assert load_form_aggregate(db_session, form.id) == compute_form_aggregate(db_session, form.id)
+
+
+def test_edit_then_report_without_scheduler(client, db_session, seeded_data, monkeypatch):
+    monkeypatch.delenv("ENABLE_REPORT_SCHEDULER", raising=False)
+    assert configure_report_scheduler() is None
+    form = seeded_data["form"]
+    number_value = db_session.execute(select(ResponseFieldValue).where(ResponseFieldValue.value == "5")).scalar_one()
+    db_session.delete(number_value)
+    db_session.commit()
+
+    stored = db_session.execute(
+        select(FormReportAggregate.is_stale).where(FormReportAggregate.form_id == form.id)
+    ).scalar_one()
+    assert stored is False
+    response = client.get(f"/reports/forms/{form.id}", headers={"X-Role": "admin"})
+    assert response.status_code == 200
+    number_stats = next(field for field in response.json()["fields"] if field["name"] == "Hazards Found")
+    assert (number_stats["statistics"]["min"], number_stats["statistics"]["max"]) == (7.0, 7.0)
+
+
+def test_unmaterialised_forms_are_picked_up_by_rebuild(db_session, seeded_data):
+    form = seeded_data["form"]
+    db_session.execute(delete(FormReportAggregate).where(FormReportAggregate.form_id == form.id))
+    db_session.add(FormResponse(form_id=form.id, status=ResponseStatus.draft, is_completed=False))
+    db_session.commit()
+    assert load_form_aggregate(db_session, form.id) is None
+
+    assert rebuild_all_form_aggregates(db_session) == 1
+    db_session.commit()
+
+    materialised = load_form_aggregate(db_session, form.id)
+    assert materialised.total_responses == 4
+    assert materialised == compute_form_aggregate(db_session, form.id)
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import pytest
+from sqlalchemy import insert
+
+from backend.app.exports import EXPORT_BATCH_SIZE
+from backend.app.models import FormResponse, ResponseStatus
+
+
 def test_report_endpoint_returns_data(client, seeded_data):
     form = seeded_data["form"]
     response = client.get(f"/reports/forms/{form.id}", headers={"X-Role": "admin"})
@@ -35,3 +42,47 @@ def test_export_pdf_endpoint(client, seeded_data):
     )
     assert response.status_code == 200
     assert "application/pdf" in response.headers["content-type"].lower()
+
+
+def test_export_responses_csv_endpoint(client, seeded_data):
+    form = seeded_data["form"]
+    response = client.get(f"/reports/forms/{form.id}/responses.csv", headers={"X-Role": "analyst"})
+    assert response.status_code == 200
+    assert "text/csv" in response.headers["content-type"].lower()
+    lines = response.text.strip().splitlines()
+    assert lines[0].startswith("Response ID,Status")
+    assert len(lines) == 4
+
+
+def test_export_responses_csv_streams_every_batch(client, db_session, seeded_data):
+    form = seeded_data["form"]
+    extra = 2 * EXPORT_BATCH_SIZE + 5
+    db_session.execute(
+        insert(FormResponse),
+        [{"form_id": form.id, "status": ResponseStatus.draft, "is_completed": False} for _ in range(extra)],
+    )
+    db_session.commit()
+
+    response = client.get(f"/reports/forms/{form.id}/responses.csv", headers={"X-Role": "analyst"})
+
+    assert response.status_code == 200
+    lines = response.text.strip().splitlines()
+    assert len(lines) == 1 + 3 + extra
+    assert len({line.split(",", 1)[0] for line in lines[1:]}) == 3 + extra
+
+
+def test_export_responses_csv_unknown_form(client, seeded_data):
+    response = client.get("/reports/forms/999/responses.csv", headers={"X-Role": "analyst"})
+    assert response.status_code == 404
+
+
+def test_export_parquet_endpoint(client, seeded_data):
+    pytest.importorskip("pyarrow")
+    form = seeded_data["form"]
+    response = client.get(
+        f"/reports/forms/{form.id}/export",
+        params={"format": "parquet"},
+        headers={"X-Role": "analyst"},
+    )
+    assert response.status_code == 200
+    assert response.content.startswith(b"PAR1")
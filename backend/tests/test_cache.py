@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from sqlalchemy import select
+
+from backend.app.cache import ReportCache, report_cache
+from backend.app.models import ResponseFieldValue
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_entries():
+    cache = ReportCache(max_entries=2, ttl_seconds=60)
+    cache.set(1, "one")
+    cache.set(2, "two")
+    assert cache.get(1) == "one"
+    cache.set(3, "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = ReportCache(ttl_seconds=10, clock=clock)
+    cache.set(1, "report")
+    clock.now = 9.0
+    assert cache.get(1) == "report"
+    clock.now = 10.0
+    assert cache.get(1) is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_invalidate_drops_every_kind_for_a_form():
+    cache = ReportCache()
+    cache.set(1, "report")
+    cache.set(1, b"csv", kind="csv")
+    cache.set(2, "other")
+
+    cache.invalidate(1)
+
+    assert cache.get(1) is None and cache.get(1, "csv") is None
+    assert cache.get(2) == "other"
+
+
+def test_invalidation_during_compute_discards_the_stale_result():
+    cache = ReportCache()
+
+    def compute_while_a_commit_lands():
+        cache.invalidate(1)
+        return "stale"
+
+    assert cache.get_or_compute(1, compute_while_a_commit_lands) == "stale"
+    assert cache.get(1) is None
+    assert cache.get_or_compute(1, lambda: "fresh") == "fresh"
+    assert cache.get(1) == "fresh"
+
+
+def test_report_endpoint_uses_cache_until_values_change(client, db_session, seeded_data):
+    form = seeded_data["form"]
+    headers = {"X-Role": "admin"}
+
+    first = client.get(f"/reports/forms/{form.id}", headers=headers).json()
+    client.get(f"/reports/forms/{form.id}", headers=headers)
+    assert report_cache.stats()["hits"] == 1
+
+    value = db_session.execute(select(ResponseFieldValue).where(ResponseFieldValue.value == "Open")).scalar_one()
+    value.value = "Closed"
+    db_session.commit()
+
+    refreshed = client.get(f"/reports/forms/{form.id}", headers=headers).json()
+    choice = next(field for field in refreshed["fields"] if field["name"] == "Site Status")
+    assert choice["statistics"]["distribution"] == {"Closed": 2}
+    assert refreshed != first
+
+    stats = client.get("/reports/cache/stats", headers=headers).json()
+    assert stats["invalidations"] == 1
+    assert stats["misses"] == 2
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import sys
+import threading
+from dataclasses import replace
+
+import pytest
+
+from backend.database import ConcurrentUpdateError, InMemoryDatabase, SQLiteDatabase
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def database(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryDatabase()
+    return SQLiteDatabase(str(tmp_path / "chat.db"))
+
+
+def test_list_messages_uses_form_response_index(database):
+    db = database
+    first = db.add_message(form_response_id=1, author_id=1, body="first")
+    db.add_message(form_response_id=2, author_id=1, body="elsewhere")
+    second = db.add_message(form_response_id=1, author_id=2, body="second")
+
+    assert db.list_messages(1) == [first, second]
+    assert db.list_messages(3) == []
+
+    db.list_messages(1).clear()
+    assert db.list_messages(1) == [first, second]
+
+
+def test_list_notifications_uses_user_index(database):
+    db = database
+    mine = db.add_notification(user_id=1, form_response_id=None, message="a", notif_type="message")
+    db.add_notification(user_id=2, form_response_id=None, message="b", notif_type="message")
+
+    assert db.list_notifications(1) == [mine]
+    assert db.mark_notification_read(mine.id, 1)
+    assert db.list_notifications(1)[0].is_read
+
+
+def test_update_form_response_is_compare_and_set(database):
+    db = database
+    stored = db.add_form_response(form_id=1, data={}, created_by_id=1)
+    first = replace(stored, status="in_progress")
+    second = replace(stored, status="closed")
+
+    db.update_form_response(first)
+    with pytest.raises(ConcurrentUpdateError):
+        db.update_form_response(second)
+
+    current = db.get_form_response(stored.id)
+    assert current.status == "in_progress"
+    assert current.version == 2
+    assert stored.status == "open"
+
+
+
+def test_update_of_missing_form_response_raises_and_keeps_version(database):
+    stored = database.add_form_response(form_id=1, data={}, created_by_id=1)
+    missing = replace(stored, id=stored.id + 100)
+
+    with pytest.raises(KeyError):
+        database.update_form_response(missing)
+
+    assert missing.version == 1
+    assert database.get_form_response(missing.id) is None
+
+def test_listing_pages_by_id_cursor(database):
+    db = database
+    messages = [db.add_message(form_response_id=1, author_id=1, body=str(i)) for i in range(5)]
+    notifications = [db.add_notification(7, None, str(i), "message") for i in range(5)]
+
+    assert [m.id for m in db.list_messages(1, after_id=messages[1].id, limit=2)] == [messages[2].id, messages[3].id]
+    assert db.list_messages(1, after_id=messages[-1].id) == []
+    newest = db.list_notifications(7, limit=2, newest_first=True)
+    assert [n.id for n in newest] == [notifications[4].id, notifications[3].id]
+    older = db.list_notifications(7, after_id=newest[-1].id, limit=10, newest_first=True)
+    assert [n.id for n in older] == [n.id for n in reversed(notifications[:3])]
+
+
+def test_unread_counter_tracks_reads(database):
+    db = database
+    first = db.add_notification(7, None, "a", "message")
+    db.add_notification(7, None, "b", "message")
+    db.add_notification(8, None, "c", "message")
+
+    assert db.count_unread_notifications(7) == 2
+    assert db.mark_notification_read(first.id, 7)
+    assert db.mark_notification_read(first.id, 7)
+    assert not db.mark_notification_read(first.id, 8)
+    assert db.count_unread_notifications(7) == 1
+    assert db.count_unread_notifications(8) == 1
+    assert db.count_unread_notifications(9) == 0
+
+
+def test_add_notifications_reserves_a_contiguous_range_and_shares_context(database):
+    db = database
+    db.add_notification(1, None, "single", "message")
+    context = {"form_response_id": 4}
+
+    notifications = db.add_notifications([1, 2, 3], 4, "message", context)
+
+    assert [n.id for n in notifications] == [2, 3, 4]
+    assert all(n.message is None and n.context == context for n in notifications)
+    assert db.add_notification(2, None, "after", "message").id == 5
+    assert db.count_unread_notifications(1) == 2
+    stored = db.list_notifications(3)
+    assert stored[0].context == context and stored[0].message is None
+    assert db.list_notifications(1)[0].message == "single"
+    assert db.add_notifications([], 4, "message", context) == []
+
+
+@pytest.fixture()
+def fast_thread_switching():
+    """Switch threads far more often than usual to force interleavings."""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def test_concurrent_writers_keep_invariants(database, fast_thread_switching):
+    db = database
+    users = [db.add_user(f"user{i}@example.com", f"User {i}") for i in range(4)]
+    responses = [db.add_form_response(form_id=1, data={"count": 0}, created_by_id=users[0].id) for _ in range(8)]
+    threads_count, iterations = 8, 300
+    barrier = threading.Barrier(threads_count)
+
+    def increment(form_response_id: int) -> None:
+        while True:
+            current = db.get_form_response(form_response_id)
+            candidate = replace(current, data={"count": current.data["count"] + 1})
+            try:
+                db.update_form_response(candidate)
+                return
+            except ConcurrentUpdateError:
+                continue
+
+    def worker(index: int) -> None:
+        barrier.wait()
+        for i in range(iterations):
+            response = responses[(index + i) % len(responses)]
+            increment(response.id)
+            db.add_message(response.id, users[index % len(users)].id, f"{index}-{i}")
+            note = db.add_notification(users[i % len(users)].id, response.id, "update", "message")
+            db.mark_notification_read(note.id, note.user_id)
+            assert db.list_messages(response.id)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = threads_count * iterations
+    messages = [m for response in responses for m in db.list_messages(response.id)]
+    notifications = [n for user in users for n in db.list_notifications(user.id)]
+    assert sorted(m.id for m in messages) == list(range(1, total + 1))
+    assert sorted(n.id for n in notifications) == list(range(1, total + 1))
+    assert all(notification.is_read for notification in notifications)
+    assert all(db.count_unread_notifications(user.id) == 0 for user in users)
+    for response in responses:
+        ids = [m.id for m in db.list_messages(response.id)]
+        assert ids == sorted(ids)
+    counts = [db.get_form_response(response.id).data["count"] for response in responses]
+    versions = [db.get_form_response(response.id).version for response in responses]
+    assert sum(counts) == total
+    assert versions == [count + 1 for count in counts]
+
+
+def test_sqlite_database_persists_across_instances(tmp_path):
+    path = str(tmp_path / "chat.db")
+    db = SQLiteDatabase(path)
+    user = db.add_user("a@example.com", "A")
+    with db.batch():
+        form = db.add_form_response(form_id=3, data={"answer": 42}, created_by_id=user.id)
+        db.add_message(form.id, user.id, "hello")
+    db.close()
+
+    reopened = SQLiteDatabase(path)
+    assert reopened.get_user(user.id) == user
+    assert reopened.get_form_response(form.id).data == {"answer": 42}
+    assert [m.body for m in reopened.list_messages(form.id)] == ["hello"]
+    assert reopened._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_batch_rolls_back_on_error(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "chat.db"))
+    with pytest.raises(RuntimeError):
+        with db.batch():
+            db.add_message(1, 1, "lost")
+            raise RuntimeError("boom")
+    assert db.list_messages(1) == []
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from backend import encoding
+from backend.database import Message
+
+
+@pytest.fixture(params=sorted(encoding.BACKENDS))
+def encoder(request):
+    previous = encoding.backend
+    encoding.configure_encoder(request.param)
+    yield request.param
+    encoding.configure_encoder(previous)
+
+
+def test_dataclasses_and_datetimes_encode_directly(encoder):
+    created_at = datetime(2024, 5, 1, 12, 30, 0, 250)
+    message = Message(id=1, form_response_id=2, author_id=3, body="héllo", created_at=created_at)
+
+    payload = encoding.dumps({"items": [message]})
+
+    assert isinstance(payload, bytes)
+    assert encoding.loads(payload) == {
+        "items": [
+            {
+                "id": 1,
+                "form_response_id": 2,
+                "author_id": 3,
+                "body": "héllo",
+                "parent_id": None,
+                "created_at": created_at.isoformat(),
+            }
+        ]
+    }
+
+
+def test_unknown_encoder_is_rejected():
+    with pytest.raises(ValueError):
+        encoding.configure_encoder("yaml")
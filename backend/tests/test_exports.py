@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from backend.app.exports import build_csv_report, build_pdf_report
+import csv
+import io
+
+import pytest
+
+from backend.app.exports import build_columnar_export, build_csv_report, build_pdf_report, iter_responses_csv
+from backend.app.models import FieldType, FormField
 from backend.app.reporting import get_form_report
 
 
@@ -24,3 +30,52 @@ def test_build_pdf_report(db_session, seeded_data):
     pdf_bytes = pdf_buffer.getvalue()
     assert pdf_bytes.startswith(b"%PDF")
     assert b"Form Report" in pdf_bytes
+
+
+def test_iter_responses_csv_pivots_one_line_per_response(db_session, seeded_data):
+    form = seeded_data["form"]
+
+    rows = list(csv.reader(io.StringIO("".join(iter_responses_csv(db_session, form, batch_size=1)))))
+
+    assert rows[0] == ["Response ID", "Status", "Completed", "Submitted At", "Hazards Found", "Site Status", "Notes"]
+    assert [row[1:3] + row[4:] for row in rows[1:]] == [
+        ["completed", "yes", "5", "Open", ""],
+        ["completed", "yes", "7", "Closed", "All issues resolved"],
+        ["submitted", "no", "", "", ""],
+    ]
+
+
+def test_build_columnar_export_types_columns_per_field(db_session, seeded_data):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    form = seeded_data["form"]
+
+    table = pq.read_table(build_columnar_export(db_session, form, "parquet", batch_size=2))
+
+    assert table.num_rows == 3
+    assert table.schema.field("Hazards Found").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("Site Status").type)
+    assert table.column("Hazards Found").to_pylist() == [5.0, 7.0, None]
+    assert table.column("Site Status").to_pylist() == ["Open", "Closed", None]
+
+    stream = build_columnar_export(db_session, form, "arrow", batch_size=2)
+    assert pa.ipc.open_stream(stream).read_all().column("Notes").to_pylist() == [None, "All issues resolved", None]
+
+
+def test_build_columnar_export_disambiguates_colliding_field_names(db_session, seeded_data):
+    pq = pytest.importorskip("pyarrow.parquet")
+    form = seeded_data["form"]
+    duplicate = FormField(form_id=form.id, name="Notes", field_type=FieldType.text)
+    reserved = FormField(form_id=form.id, name="status", field_type=FieldType.text)
+    db_session.add_all([duplicate, reserved])
+    db_session.commit()
+    db_session.refresh(form)
+    notes = seeded_data["fields"]["text"]
+
+    table = pq.read_table(build_columnar_export(db_session, form, "parquet"))
+
+    names = table.schema.names
+    assert len(names) == len(set(names))
+    assert names[:4] == ["response_id", "status", "is_completed", "submitted_at"]
+    assert {f"Notes__{notes.id}", f"Notes__{duplicate.id}", f"status__{reserved.id}", "Hazards Found"} <= set(names)
+    assert table.column(f"Notes__{notes.id}").to_pylist() == [None, "All issues resolved", None]
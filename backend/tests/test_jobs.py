@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+import pytest
+
+from backend.app import main
+from backend.app.jobs import ExportJobQueue, ExportJobStatus
+from backend.app.reporting import get_form_report
+
+
+@pytest.fixture()
+def export_queue(tmp_path, monkeypatch):
+    queue = ExportJobQueue(tmp_path)
+    monkeypatch.setattr(main, "export_jobs", queue)
+    yield queue
+    queue.shutdown()
+
+
+def test_queue_renders_artifact(db_session, seeded_data, export_queue):
+    form_id = seeded_data["form"].id
+
+    submitted = export_queue.submit(form_id, "csv", lambda: get_form_report(db_session, form_id))
+    job = export_queue.wait(submitted.id, timeout=5)
+
+    assert job.status == ExportJobStatus.completed
+    assert job.path.parent == export_queue.artifact_dir
+    assert b"Hazards Found" in job.path.read_bytes()
+
+
+def test_queue_rejects_unknown_format(db_session, seeded_data, export_queue):
+    form_id = seeded_data["form"].id
+    with pytest.raises(ValueError):
+        export_queue.submit(form_id, "xlsx", lambda: get_form_report(db_session, form_id))
+
+
+def test_job_evicted_while_running_discards_its_artifact(db_session, seeded_data, tmp_path):
+    form_id = seeded_data["form"].id
+    report = get_form_report(db_session, form_id)
+    started, release = Event(), Event()
+
+    def slow_report():
+        started.set()
+        release.wait(5)
+        return report
+
+    queue = ExportJobQueue(tmp_path, executor=ThreadPoolExecutor(max_workers=1), max_jobs=1)
+    try:
+        running = queue.submit(form_id, "csv", slow_report)
+        assert started.wait(5)
+        queued = queue.submit(form_id, "csv", lambda: report)
+        latest = queue.submit(form_id, "csv", lambda: report)
+        release.set()
+        assert queue.wait(latest.id, timeout=5).status == ExportJobStatus.completed
+    finally:
+        queue.shutdown()
+
+    assert running.path is None
+    assert queued.status == ExportJobStatus.pending
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{latest.id}.csv"]
+
+
+def test_export_job_endpoints(client, seeded_data, export_queue):
+    form = seeded_data["form"]
+    headers = {"X-Role": "manager"}
+
+    created = client.post(f"/reports/forms/{form.id}/exports", params={"format": "csv"}, headers=headers)
+    assert created.status_code == 202
+    job_id = created.json()["job_id"]
+    export_queue.wait(job_id, timeout=5)
+
+    status = client.get(f"/reports/exports/{job_id}", headers=headers).json()
+    assert status["status"] == "completed"
+
+    download = client.get(status["download_url"], headers=headers)
+    assert download.status_code == 200
+    assert "text/csv" in download.headers["content-type"]
+    assert "Completion Rate" in download.text
+
+    assert client.get("/reports/exports/unknown", headers=headers).status_code == 404
+    missing = client.post("/reports/forms/9999/exports", params={"format": "csv"}, headers=headers)
+    assert missing.status_code == 404
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, inspect, insert, select
+
+from backend.app.aggregates import compute_form_aggregate, load_form_aggregate
+from backend.app.migrations import add_typed_value_columns, backfill_typed_values, ensure_reporting_indexes, migrate
+from backend.app.models import FormReportAggregate, ResponseFieldValue
+
+
+def test_typed_values_are_populated_on_write(db_session, seeded_data):
+    rows = db_session.execute(
+        select(ResponseFieldValue.value, ResponseFieldValue.numeric_value, ResponseFieldValue.choice_value)
+    ).all()
+    assert ("5", 5.0, None) in rows
+    assert ("Open", None, "Open") in rows
+    assert ("All issues resolved", None, None) in rows
+
+
+def test_migration_adds_columns_and_backfills(engine, db_session, seeded_data):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_response_field_values_response_field_numeric")
+        connection.exec_driver_sql("ALTER TABLE response_field_values DROP COLUMN numeric_value")
+        connection.exec_driver_sql("ALTER TABLE response_field_values DROP COLUMN choice_value")
+
+    assert add_typed_value_columns(engine) == ["numeric_value", "choice_value"]
+    assert add_typed_value_columns(engine) == []
+
+    assert backfill_typed_values(engine, batch_size=2) == 4
+    assert backfill_typed_values(engine) == 0
+    rows = db_session.execute(select(ResponseFieldValue.value, ResponseFieldValue.numeric_value)).all()
+    assert ("7", 7.0) in rows
+
+
+def test_backfill_types_rows_written_outside_the_orm(engine, db_session, seeded_data):
+    number_field = seeded_data["fields"]["number"]
+    response_id = db_session.execute(select(ResponseFieldValue.response_id)).scalars().first()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(ResponseFieldValue).values(response_id=response_id, field_id=number_field.id, value="11")
+        )
+
+    assert backfill_typed_values(engine) == 1
+    assert db_session.execute(
+        select(ResponseFieldValue.numeric_value).where(ResponseFieldValue.value == "11")
+    ).scalar_one() == 11.0
+
+
+def test_reporting_indexes_replace_legacy_single_column_indexes(engine):
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_form_responses_form_status_completed")
+        connection.exec_driver_sql("CREATE INDEX ix_form_responses_form_id ON form_responses (form_id)")
+        connection.exec_driver_sql("CREATE INDEX ix_response_field_values_field_id ON response_field_values (field_id)")
+
+    assert ensure_reporting_indexes(engine) == {
+        "created": ["ix_form_responses_form_status_completed"],
+        "dropped": ["ix_form_responses_form_id", "ix_response_field_values_field_id"],
+    }
+    assert ensure_reporting_indexes(engine) == {"created": [], "dropped": []}
+    index_names = {index["name"] for index in inspect(engine).get_indexes("form_responses")}
+    assert "ix_form_responses_form_status_completed" in index_names
+    assert "ix_form_responses_form_id" not in index_names
+
+
+def test_migrate_seeds_aggregates_of_existing_forms(engine, db_session, seeded_data):
+    form = seeded_data["form"]
+    db_session.execute(delete(FormReportAggregate).where(FormReportAggregate.form_id == form.id))
+    db_session.commit()
+    assert load_form_aggregate(db_session, form.id) is None
+
+    migrate(engine)
+
+    assert load_form_aggregate(db_session, form.id) == compute_form_aggregate(db_session, form.id)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from backend.database import InMemoryDatabase
+from backend.notifications import NotificationService
+
+
+def test_fan_out_renders_messages_when_read():
+    db = InMemoryDatabase()
+    creator = db.add_user("creator@example.com", "Creator")
+    assignee = db.add_user("assignee@example.com", "Assignee")
+    admin = db.add_user("admin@example.com", "Admin", is_admin=True)
+    form = db.add_form_response(form_id=1, data={}, created_by_id=creator.id)
+    form.assigned_user_id = assignee.id
+    form.status = "completed"
+    service = NotificationService(db)
+
+    service.notify_status_change(form, admin)
+
+    first, second = (db.list_notifications(user.id)[0] for user in (creator, assignee))
+    assert first.context is second.context
+    assert second.id == first.id + 1
+    summary = service.unread_summary(assignee.id)
+    assert summary["unread_count"] == 1
+    assert summary["items"][0]["message"] == "Form response #1 status changed to completed by Admin."
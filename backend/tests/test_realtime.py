@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from backend.realtime import ConnectionManager, OverflowPolicy, form_response_topic, user_topic
+
+
+def test_events_fan_out_to_subscribers_only():
+    manager = ConnectionManager()
+    first = manager.subscribe(form_response_topic(1))
+    second = manager.subscribe(form_response_topic(1), user_topic(5))
+
+    manager.queue_broadcast(1, {"event": "message_created"})
+    manager.queue_broadcast(2, {"event": "ignored"})
+    manager.publish(user_topic(5), {"event": "notification"})
+
+    assert first.drain() == [{"event": "message_created"}]
+    assert second.drain() == [{"event": "message_created"}, {"event": "notification"}]
+    assert first.drain() == []
+    assert manager.stats()["topics"] == 2
+
+
+def test_topics_are_removed_with_their_last_subscriber():
+    manager = ConnectionManager()
+    subscription = manager.subscribe(form_response_topic(1))
+    subscription.close()
+
+    manager.queue_broadcast(1, {"event": "message_created"})
+
+    assert manager.subscriber_count(form_response_topic(1)) == 0
+    assert manager.stats()["topics"] == 0
+    assert subscription.closed
+
+
+def test_drop_oldest_keeps_the_newest_events():
+    manager = ConnectionManager(max_queue=2)
+    subscription = manager.subscribe(form_response_topic(1))
+
+    for index in range(5):
+        manager.queue_broadcast(1, {"index": index})
+
+    assert [event["index"] for event in subscription.drain()] == [3, 4]
+    stats = manager.stats()
+    assert stats["dropped"] == 3
+    assert stats["delivered"] == 5
+
+
+def test_disconnect_policy_removes_slow_subscribers():
+    manager = ConnectionManager(max_queue=2, overflow=OverflowPolicy.DISCONNECT)
+    wakeups = []
+    slow = manager.subscribe(form_response_topic(1), notify=lambda: wakeups.append(1))
+    fast = manager.subscribe(form_response_topic(1), max_queue=10)
+
+    for index in range(3):
+        manager.queue_broadcast(1, {"index": index})
+
+    assert slow.closed
+    assert [event["index"] for event in slow.drain()] == [0, 1]
+    assert len(fast.drain()) == 3
+    assert len(wakeups) == 3
+    assert manager.stats()["disconnected"] == 1
+    assert manager.subscriber_count(form_response_topic(1)) == 1
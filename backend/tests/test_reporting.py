@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from sqlalchemy import event
+
+from backend.app.models import FieldType, Form, FormField, FormResponse, ResponseFieldValue, ResponseStatus
 from backend.app.reporting import get_form_report
 
 
@@ -31,3 +34,79 @@ def test_report_requires_existing_form(db_session):
         assert "not found" in str(exc)
     else:  # pragma: no cover - defensive
         raise AssertionError("Expected ValueError for missing form")
+
+
+def _count_statements(engine, callback) -> int:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        callback()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return len(statements)
+
+
+def test_report_query_count_is_independent_of_field_count(engine, db_session):
+    def _build_form(field_count: int) -> int:
+        form = Form(name=f"Form with {field_count} fields")
+        db_session.add(form)
+        db_session.flush()
+        field_types = [FieldType.number, FieldType.choice, FieldType.text]
+        fields = [
+            FormField(form_id=form.id, name=f"Field {index}", field_type=field_types[index % 3])
+            for index in range(field_count)
+        ]
+        db_session.add_all(fields)
+        response = FormResponse(form_id=form.id, status=ResponseStatus.completed, is_completed=True)
+        db_session.add(response)
+        db_session.flush()
+        db_session.add_all(
+            [ResponseFieldValue(response_id=response.id, field_id=field.id, value=str(index)) for index, field in enumerate(fields)]
+        )
+        db_session.commit()
+        return form.id
+
+    small_form_id = _build_form(3)
+    large_form_id = _build_form(150)
+    db_session.expire_all()
+
+    small_count = _count_statements(engine, lambda: get_form_report(db_session, small_form_id))
+    large_count = _count_statements(engine, lambda: get_form_report(db_session, large_form_id))
+    assert small_count == large_count
+
+    report = get_form_report(db_session, large_form_id)
+    assert len(report.fields) == 150
+    assert report.fields[0].statistics == {"count": 1, "average": 0.0, "min": 0.0, "max": 0.0}
+    assert report.fields[1].statistics == {"distribution": {"1": 1}}
+    assert report.fields[2].statistics == {"count": 1}
+
+
+def test_report_filters_completed_responses_server_side(engine, db_session, seeded_data):
+    form = seeded_data["form"]
+    number_field = seeded_data["fields"]["number"]
+    draft = FormResponse(form_id=form.id, status=ResponseStatus.draft, is_completed=False)
+    db_session.add(draft)
+    db_session.flush()
+    db_session.add(ResponseFieldValue(response_id=draft.id, field_id=number_field.id, value="100"))
+    db_session.commit()
+
+    statements: list[tuple[str, object]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        report = get_form_report(db_session, form.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert report.summary.total_responses == 4
+    number_stats = next(field for field in report.fields if field.name == "Hazards Found").statistics
+    assert number_stats["max"] == 7.0
+    assert all("group_concat" not in statement.lower() for statement, _ in statements)
+    assert all(len(parameters) <= 5 for _, parameters in statements)
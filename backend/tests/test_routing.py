@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from backend.database import InMemoryDatabase
+from backend.main import App, Response, app as api
+
+
+def _echo(request: dict, headers: dict[str, str]) -> Response:
+    return Response(200, {"params": request["params"], "query": request["query"]})
+
+
+def _app() -> App:
+    app = App(InMemoryDatabase())
+    app.route("GET", "/form-responses/{form_response_id}")(_echo)
+    app.route("GET", "/form-responses/{form_response_id}/messages")(_echo)
+    app.route("GET", "/form-responses/latest")(lambda request, headers: Response(200, {"latest": True}))
+    app.route("GET", "/users/{email:str}")(_echo)
+    return app
+
+
+def test_routes_convert_parameters_and_strip_query_string():
+    app = _app()
+
+    response = app.handle("GET", "/form-responses/7/messages?limit=5&after_id=2")
+
+    assert response.status_code == 200
+    assert response.json() == {"params": {"form_response_id": 7}, "query": {"limit": "5", "after_id": "2"}}
+    assert app.handle("GET", "/users/a@example.com").json()["params"] == {"email": "a@example.com"}
+
+
+def test_static_segments_take_precedence_over_parameters():
+    assert _app().handle("GET", "/form-responses/latest").json() == {"latest": True}
+
+
+def test_non_numeric_ids_and_unknown_methods_are_not_found():
+    app = _app()
+
+    assert app.handle("GET", "/form-responses/abc").status_code == 404
+    assert app.handle("GET", "/form-responses/-1/messages").status_code == 404
+    assert app.handle("POST", "/form-responses/1").status_code == 404
+    assert app.handle("GET", "/form-responses/1/unknown").status_code == 404
+
+
+def test_patch_rejects_malformed_versions():
+    creator = api.db.add_user("versions@example.com", "Versions")
+    headers = {"X-User-Id": str(creator.id)}
+    form = api.handle("POST", "/form-responses", headers=headers, body={"form_id": 1}).json()
+    path = f"/form-responses/{form['id']}"
+
+    for version in ("x", None, -1, 1.5, True):
+        response = api.handle("PATCH", path, headers=headers, body={"version": version, "status": "completed"})
+        assert response.status_code == 400
+    assert api.handle("PATCH", path, headers=headers, body={"version": "1", "status": "completed"}).status_code == 200
+    assert api.handle("PATCH", path, headers=headers, body={"version": 1, "status": "open"}).status_code == 409
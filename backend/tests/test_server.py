@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import http.client
+import socket
+import threading
+
+from backend.server import make_server
+
+
+def test_threaded_server_is_not_blocked_by_an_idle_client():
+    server = make_server("127.0.0.1", 0, mode="threaded", workers=2)
+    host, port = server.server_address[:2]
+    serving = threading.Thread(target=server.serve_forever, daemon=True)
+    serving.start()
+    idle = socket.create_connection((host, port))
+    try:
+        connection = http.client.HTTPConnection(host, port, timeout=5)
+        for _ in range(3):
+            connection.request("GET", "/notifications")
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 401
+            assert response.getheader("Connection") is None
+        connection.close()
+    finally:
+        idle.close()
+        server.shutdown()
+        server.server_close()
+    serving.join(timeout=5)
+    assert not serving.is_alive()
+
+
+def test_keep_alive_connections_are_closed_once_stopping():
+    server = make_server("127.0.0.1", 0, mode="threaded", workers=1)
+    host, port = server.server_address[:2]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        server.stopping.set()
+        connection = http.client.HTTPConnection(host, port, timeout=5)
+        connection.request("GET", "/notifications")
+        response = connection.getresponse()
+        response.read()
+        assert response.getheader("Connection") == "close"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
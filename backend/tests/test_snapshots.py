@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from backend.app.models import ReportSnapshot
+from backend.app.reporting import get_form_report
+from backend.app.snapshots import SNAPSHOT_RETENTION, get_fresh_report, get_latest_snapshot, save_report_snapshot
+
+
+def test_snapshots_are_versioned_and_pruned(db_session, seeded_data):
+    form = seeded_data["form"]
+    report = get_form_report(db_session, form.id)
+
+    versions = [save_report_snapshot(db_session, report).version for _ in range(SNAPSHOT_RETENTION + 2)]
+    db_session.commit()
+
+    assert versions == list(range(1, SNAPSHOT_RETENTION + 3))
+    assert db_session.query(ReportSnapshot).filter_by(form_id=form.id).count() == SNAPSHOT_RETENTION
+    assert get_latest_snapshot(db_session, form.id).version == versions[-1]
+
+
+def test_fresh_snapshot_round_trips_report(db_session, seeded_data):
+    form = seeded_data["form"]
+    report = get_form_report(db_session, form.id)
+    save_report_snapshot(db_session, report)
+    db_session.commit()
+
+    assert get_fresh_report(db_session, form.id, timedelta(minutes=5)) == report
+
+
+def test_stale_snapshot_is_ignored(db_session, seeded_data):
+    form = seeded_data["form"]
+    snapshot = save_report_snapshot(db_session, get_form_report(db_session, form.id))
+    snapshot.generated_at = datetime.utcnow() - timedelta(hours=2)
+    db_session.commit()
+
+    assert get_fresh_report(db_session, form.id, timedelta(hours=1)) is None
+
+
+def test_report_endpoint_serves_fresh_snapshot(client, db_session, seeded_data):
+    form = seeded_data["form"]
+    report = get_form_report(db_session, form.id)
+    report.summary.total_responses = 42
+    save_report_snapshot(db_session, report)
+    db_session.commit()
+
+    cached = client.get(f"/reports/forms/{form.id}", params={"max_age": 60}, headers={"X-Role": "admin"})
+    live = client.get(f"/reports/forms/{form.id}", headers={"X-Role": "admin"})
+
+    assert cached.json()["summary"]["total_responses"] == 42
+    assert live.json()["summary"]["total_responses"] == 3
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import socket
+
+import pytest
+
+from backend.database import InMemoryDatabase
+from backend.main import user_has_access
+from backend.notifications import NotificationService
+from backend.realtime import ConnectionManager
+from backend.sse import EventStreamGateway
+
+
+@pytest.fixture()
+def gateway_setup():
+    db = InMemoryDatabase()
+    connections = ConnectionManager()
+    gateway = EventStreamGateway(db, connections, user_has_access, heartbeat=0.05)
+    gateway.start_in_thread("127.0.0.1", 0)
+    yield db, connections, gateway
+    gateway.stop_in_thread()
+
+
+def _open_stream(gateway: EventStreamGateway, query: str) -> socket.socket:
+    stream = socket.create_connection(gateway.address, timeout=5)
+    stream.sendall(f"GET /events?{query} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+    return stream
+
+
+def _read_until(stream: socket.socket, marker: bytes) -> bytes:
+    data = b""
+    while marker not in data:
+        chunk = stream.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def test_stream_pushes_messages_and_notifications(gateway_setup):
+    db, connections, gateway = gateway_setup
+    creator = db.add_user("creator@example.com", "Creator")
+    assignee = db.add_user("assignee@example.com", "Assignee")
+    form = db.add_form_response(form_id=1, data={}, created_by_id=creator.id)
+
+    stream = _open_stream(gateway, f"user_id={creator.id}&form_response_id={form.id}")
+    try:
+        assert _read_until(stream, b"retry: 3000\n\n").startswith(b"HTTP/1.1 200 OK")
+        assert _read_until(stream, b": keep-alive\n\n")
+
+        connections.queue_broadcast(form.id, {"event": "message_created", "message": {"id": 1}})
+        NotificationService(db, connections).notify_assignment(form, creator, assignee)
+
+        received = _read_until(stream, b"event: notification_created")
+        received += _read_until(stream, b"\n\n")
+    finally:
+        stream.close()
+
+    assert b'event: message_created\ndata: {"event":"message_created","message":{"id":1}}\n\n' in received
+    assert b'"unread_count":1' in received
+
+
+def test_stream_rejects_unknown_users_and_foreign_form_responses(gateway_setup):
+    db, _, gateway = gateway_setup
+    owner = db.add_user("owner@example.com", "Owner")
+    stranger = db.add_user("stranger@example.com", "Stranger")
+    form = db.add_form_response(form_id=1, data={}, created_by_id=owner.id)
+
+    for query, status in (("user_id=99", b"401"), (f"user_id={stranger.id}&form_response_id={form.id}", b"403"), ("user_id=x", b"400")):
+        stream = _open_stream(gateway, query)
+        try:
+            assert _read_until(stream, b"\r\n").split(b" ")[1] == status
+        finally:
+            stream.close()
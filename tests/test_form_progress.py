@@ -1,4 +1,6 @@
 import sys
+from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -6,7 +8,17 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 import pytest
 from fastapi.testclient import TestClient
 
-from backend.app import app, reset_state
+from backend import forms_api
+from backend.forms_api import (
+    FORM_RESPONSES,
+    FORMS,
+    FormField,
+    FormTemplate,
+    ResponseIdAllocator,
+    app,
+    register_form,
+    reset_state,
+)
 
 
 client = TestClient(app)
@@ -97,3 +109,243 @@ def test_reassignment_keeps_progress() -> None:
     old_assignments = client.get("/users/maria/assignments")
     assert old_assignments.status_code == 200
     assert old_assignments.json() == []
+
+
+def test_progress_tracks_patched_keys_only() -> None:
+    response_id = client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"]
+
+    first = client.patch(
+        f"/form-responses/{response_id}",
+        json={"answers": {"location": "Dock", "follow_up": "Call supplier"}},
+    ).json()
+    assert first["progress"] == pytest.approx(1 / 3, rel=1e-3)
+    assert "completed_required" not in first
+
+    repeated = client.patch(f"/form-responses/{response_id}", json={"answers": {"location": "Yard"}}).json()
+    assert repeated["progress"] == pytest.approx(1 / 3, rel=1e-3)
+    assert repeated["answers"] == {"location": "Yard", "follow_up": "Call supplier"}
+
+    cleared = client.patch(f"/form-responses/{response_id}", json={"answers": {"location": ""}}).json()
+    assert cleared["progress"] == 0
+    assert cleared["status"] == "Not Started"
+
+    completed = client.patch(
+        f"/form-responses/{response_id}",
+        json={"answers": {"incident_date": "2024-05-02", "location": "Yard", "description": "Spill"}},
+    ).json()
+    assert completed["status"] == "Complete"
+    assert completed["progress"] == pytest.approx(1.0)
+
+
+def test_assignment_indexes_follow_reassignment() -> None:
+    first = client.post("/forms/incident-report/assign", json={"user_id": "alice"}).json()["response_id"]
+    second = client.post("/forms/incident-report/assign", json={"user_id": "alice"}).json()["response_id"]
+    audit = client.post("/form-responses", json={"form_id": "safety-audit", "user_id": "alice"}).json()["id"]
+
+    alice = client.get("/users/alice/assignments").json()
+    assert [item["response_id"] for item in alice] == [first, second, audit]
+
+    client.post("/forms/incident-report/assign", json={"user_id": "bob", "response_id": first})
+    assert [item["response_id"] for item in client.get("/users/alice/assignments").json()] == [second, audit]
+    assert [item["response_id"] for item in client.get("/users/bob/assignments").json()] == [first]
+
+    form_assignments = client.get("/forms/incident-report/assignments").json()
+    assert [item["response_id"] for item in form_assignments] == [first, second]
+    assert client.get("/forms/missing/assignments").status_code == 404
+
+
+def test_batch_endpoints_create_and_assign() -> None:
+    created = client.post(
+        "/form-responses/batch",
+        json=[
+            {"form_id": "incident-report", "user_id": "alice"},
+            {"form_id": "safety-audit"},
+            {"form_id": "incident-report", "user_id": "bob"},
+        ],
+    )
+    assert created.status_code == 201
+    responses = created.json()
+    assert [item["form_id"] for item in responses] == ["incident-report", "safety-audit", "incident-report"]
+    assert len({item["id"] for item in responses}) == 3
+    assert all(item["status"] == "Not Started" for item in responses)
+    assert [item["response_id"] for item in client.get("/users/alice/assignments").json()] == [responses[0]["id"]]
+
+    assigned = client.post(
+        "/assignments/batch",
+        json=[
+            {"form_id": "safety-audit", "user_id": "lee", "response_id": responses[1]["id"]},
+            {"form_id": "safety-audit", "user_id": "lee"},
+            {"form_id": "incident-report", "user_id": "lee", "response_id": responses[0]["id"]},
+        ],
+    )
+    assert assigned.status_code == 200
+    lee_ids = [item["response_id"] for item in assigned.json()]
+    assert lee_ids[0] == responses[1]["id"]
+    assert lee_ids[1] not in {item["id"] for item in responses}
+    assert [item["response_id"] for item in client.get("/users/lee/assignments").json()] == lee_ids
+    assert client.get("/users/alice/assignments").json() == []
+
+
+def test_batch_endpoints_reject_whole_batch() -> None:
+    rejected = client.post(
+        "/form-responses/batch",
+        json=[{"form_id": "incident-report"}, {"form_id": "missing"}],
+    )
+    assert rejected.status_code == 404
+    assert client.post("/form-responses/batch", json=[{"form_id": ["x"]}]).status_code == 404
+    assert client.post("/assignments/batch", json=[{"form_id": {"id": "x"}, "user_id": "lee"}]).status_code == 404
+    assert client.post("/assignments/batch", json=[{"form_id": "safety-audit"}]).status_code == 400
+    assert client.post(
+        "/assignments/batch",
+        json=[
+            {"form_id": "safety-audit", "user_id": "lee"},
+            {"form_id": "safety-audit", "user_id": "lee", "response_id": "nope"},
+        ],
+    ).status_code == 404
+    assert client.get("/forms/incident-report/assignments").json() == []
+    assert client.get("/forms/safety-audit/assignments").json() == []
+
+
+def test_response_ids_are_unique_and_ordered_across_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    allocator = ResponseIdAllocator(worker_id=7, started_ms=1_700_000_000_000)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        batches = list(executor.map(lambda _: allocator.allocate(500), range(16)))
+    ids = [response_id for batch in batches for response_id in batch]
+    assert len(set(ids)) == len(ids) == 8000
+    assert all(batch == sorted(batch) for batch in batches)
+    assert allocator() > max(ids)
+    assert ResponseIdAllocator(worker_id=7, started_ms=1_700_000_000_001)() > allocator()
+
+    monkeypatch.delenv("FORM_RESPONSE_WORKER_ID", raising=False)
+    started_ms = 1_700_000_000_000
+    assert ResponseIdAllocator(started_ms=started_ms)() != ResponseIdAllocator(started_ms=started_ms)()
+    with pytest.raises(ValueError):
+        ResponseIdAllocator(worker_id=1 << 32)
+
+    created = client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"]
+    reset_state()
+    assert client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"] > created
+
+
+def test_form_payloads_are_cached_with_etags() -> None:
+    listing = client.get("/forms")
+    assert listing.status_code == 200
+    assert [form["id"] for form in listing.json()] == ["incident-report", "safety-audit"]
+    assert listing.json()[0]["fields"][0] == {
+        "id": "incident_date",
+        "label": "Incident Date",
+        "type": "date",
+        "required": True,
+        "options": None,
+    }
+    etag = listing.headers["etag"]
+
+    not_modified = client.get("/forms", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    form = client.get("/forms/safety-audit")
+    assert form.json()["name"] == "Safety Audit"
+    assert form.headers["etag"] != etag
+    revalidated = client.get("/forms/safety-audit", headers={"If-None-Match": f'"other", W/{form.headers["etag"]}'})
+    assert revalidated.status_code == 304
+    assert client.get("/forms/safety-audit", headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/forms/missing").status_code == 404
+
+
+def test_register_form_refreshes_cached_payloads() -> None:
+    etag = client.get("/forms").headers["etag"]
+    original = FORMS["safety-audit"]
+    try:
+        register_form(FormTemplate(id="safety-audit", name="Safety Audit v2", description="", fields=[]))
+        refreshed = client.get("/forms", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()[1]["name"] == "Safety Audit v2"
+        assert client.get("/forms/safety-audit").json()["fields"] == []
+    finally:
+        register_form(original)
+    assert client.get("/forms", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_register_form_recounts_required_fields_of_existing_responses() -> None:
+    response_id = client.post("/form-responses", json={"form_id": "safety-audit"}).json()["id"]
+    client.patch(
+        f"/form-responses/{response_id}",
+        json={"answers": {"auditor": "Maria", "audit_date": "2024-03-10"}},
+    )
+    original = FORMS["safety-audit"]
+    try:
+        register_form(
+            FormTemplate(
+                id="safety-audit",
+                name="Safety Audit",
+                description="",
+                fields=[
+                    FormField(id="auditor", label="Auditor", type="text", required=True),
+                    FormField(id="issues_found", label="Issues Found", type="textarea", required=True),
+                ],
+            )
+        )
+        recounted = client.get(f"/form-responses/{response_id}").json()
+        assert recounted["progress"] == pytest.approx(0.5)
+        assert recounted["status"] == "In Progress"
+
+        patched = client.patch(f"/form-responses/{response_id}", json={"answers": {"audit_date": "2024-03-11"}}).json()
+        assert patched["progress"] == pytest.approx(0.5)
+        cleared = client.patch(f"/form-responses/{response_id}", json={"answers": {"auditor": ""}}).json()
+        assert cleared["progress"] == 0
+    finally:
+        register_form(original)
+    assert client.get(f"/form-responses/{response_id}").json()["progress"] == pytest.approx(0.5)
+
+
+def test_registration_during_list_build_is_not_cached_over(monkeypatch: pytest.MonkeyPatch) -> None:
+    client.get("/forms/incident-report")
+    original = FORMS["safety-audit"]
+    template_dict = forms_api._template_dict
+    registering = []
+
+    def register_mid_build(form: FormTemplate) -> Dict[str, object]:
+        if form is original and not registering:
+            registering.append(form.id)
+            register_form(FormTemplate(id="safety-audit", name="Safety Audit v2", description="", fields=[]))
+        return template_dict(form)
+
+    monkeypatch.setattr(forms_api, "_FORM_LIST_PAYLOAD", None)
+    monkeypatch.setattr(forms_api, "_template_dict", register_mid_build)
+    try:
+        client.get("/forms")
+        monkeypatch.setattr(forms_api, "_template_dict", template_dict)
+        assert client.get("/forms").json()[1]["name"] == "Safety Audit v2"
+    finally:
+        register_form(original)
+
+
+def test_autosaves_lock_only_their_own_response() -> None:
+    first = client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"]
+    second = client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"]
+    while forms_api._response_lock(second) is forms_api._response_lock(first):
+        second = client.post("/form-responses", json={"form_id": "incident-report"}).json()["id"]
+
+    with forms_api._response_lock(first), ThreadPoolExecutor(max_workers=1) as executor:
+        patched = executor.submit(client.patch, f"/form-responses/{second}", json={"answers": {"location": "Dock"}})
+        assert patched.result(timeout=5).json()["progress"] == pytest.approx(1 / 3, rel=1e-3)
+
+    def toggle(index: int) -> None:
+        value = "" if index % 2 else "set"
+        client.patch(f"/form-responses/{first}", json={"answers": {"location": value, "description": value}})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(toggle, range(64)))
+    response = FORM_RESPONSES[first]
+    assert response.completed_required == sum(bool(response.answers.get(key)) for key in ("location", "description"))
+
+
+def test_batch_endpoints_enforce_max_batch_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(forms_api, "MAX_BATCH_SIZE", 2)
+    items = [{"form_id": "safety-audit", "user_id": "lee"}] * 3
+
+    assert client.post("/form-responses/batch", json=items).status_code == 413
+    assert client.post("/assignments/batch", json=items).status_code == 413
+    assert client.get("/users/lee/assignments").json() == []
+    assert client.post("/form-responses/batch", json=items[:2]).status_code == 201